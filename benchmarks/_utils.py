@@ -0,0 +1,25 @@
+"""
+Helpers shared by the benchmark scripts. Run the scripts from the repository
+root, e.g. `python -m benchmarks.bench_single_flight`.
+"""
+
+from collections.abc import Callable
+from timeit import Timer
+
+
+def time_per_call(
+    f: Callable[[], object], number: int = 100_000, repeat: int = 5
+) -> float:
+    """
+    Returns the best observed time of a single `f` call in nanoseconds.
+    """
+
+    best = min(Timer(f).repeat(repeat=repeat, number=number))
+    return best / number * 1e9
+
+
+def print_row(
+    name: str, value: float, unit: str = "ns", baseline: float | None = None
+) -> None:
+    suffix = f"  ({value / baseline:.2f}x)" if baseline else ""
+    print(f"{name:<56} {value:>12.1f} {unit}{suffix}")
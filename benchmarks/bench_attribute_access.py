@@ -0,0 +1,57 @@
+"""
+Attribute access on live `ExplicitReinitSingleton` instances compared with
+a plain object, and invalidation-aware reads of a field - wrapping it on every
+access versus the cached proxies of `auto_wrap_fields`.
+"""
+
+from safe_singleton.more import (
+    ExplicitReinitSingleton,
+    ExplicitReinitWeakRefSingleton,
+    auto_wrap_fields,
+)
+
+from benchmarks._utils import print_row, time_per_call
+
+
+class Plain:
+    def __init__(self) -> None:
+        self.x = 1
+
+
+class Strong(ExplicitReinitSingleton):
+    def __init__(self) -> None:
+        self.x = 1
+
+
+class Weak(ExplicitReinitWeakRefSingleton):
+    def __init__(self) -> None:
+        self.x = 1
+
+
+@auto_wrap_fields()
+class AutoWrapped(ExplicitReinitSingleton):
+    def __init__(self) -> None:
+        self.x = [1]
+
+
+def main() -> None:
+    plain = Plain()
+    baseline = time_per_call(lambda: plain.x, number=1_000_000)
+    print_row("plain object attribute read", baseline)
+
+    for cls in (Strong, Weak):
+        instance = cls()
+        t = time_per_call(lambda: instance.x, number=1_000_000)
+        print_row(f"{cls.__base__.__name__} attribute read", t, baseline=baseline)
+
+    strong = Strong.get_instance()
+    t = time_per_call(lambda: strong.wrap_attr(strong.x)())
+    print_row("wrap_attr and unwrap on every access", t, baseline=baseline)
+
+    auto_wrapped = AutoWrapped()
+    t = time_per_call(lambda: auto_wrapped.x, number=1_000_000)
+    print_row("auto_wrap_fields cached proxy read", t, baseline=baseline)
+
+
+if __name__ == "__main__":
+    main()
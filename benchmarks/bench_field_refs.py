@@ -0,0 +1,122 @@
+"""
+Memory and throughput of `wrap_attr` / `wrap_attr_weak` references compared with
+the previous frozen dataclass implementation, copied below.
+"""
+
+import tracemalloc
+from abc import ABC
+from dataclasses import dataclass, field
+from typing import Any
+from weakref import ReferenceType, ref
+
+from safe_singleton.exceptions import InvalidationError
+from safe_singleton.more import ExplicitReinitSingleton
+from safe_singleton.more._base import (
+    SingletonInstanceFieldRef,
+    SingletonInstanceFieldRefWeak,
+)
+from safe_singleton.utils.context import at_exit
+
+from benchmarks._utils import print_row, time_per_call
+
+
+class _LegacyRef(ABC):
+    def __call__(self) -> Any:
+        self._ensure_source_valid()
+        return self._wrapped
+
+    def is_source_valid(self, _: Any = None) -> bool:
+        return self._maybe_get_source() is not None
+
+    def _ensure_source_valid(self, source: Any = None) -> bool:
+        if not self.is_source_valid(source):
+            raise InvalidationError(self._source_t)
+
+        return True
+
+
+@dataclass(frozen=True)
+class LegacyRef(_LegacyRef):
+    _source: Any
+    _wrapped: Any
+    _source_t: type = field(init=False)
+
+    def _maybe_get_source(self) -> Any:
+        return self._source
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_source_t", type(self._source))
+
+
+@dataclass(frozen=True)
+class LegacyRefWeak(_LegacyRef):
+    _source: Any
+    _wrapped: Any
+    _source_ref: ReferenceType = field(init=False)
+
+    _source_t: type = field(init=False)
+
+    def _maybe_get_source(self) -> Any:
+        # the original read the deleted `_source` attribute here
+        return self._source_ref()
+
+    def __post_init__(self) -> None:
+        instance = self._source
+        cls = type(instance)
+
+        self_delattr = lambda name: object.__delattr__(self, name)
+        self_setattr = lambda name, val: object.__setattr__(self, name, val)
+        set_source_t = lambda: self_setattr("_source_t", cls)
+
+        with at_exit(lambda: self_delattr("_source")):
+            self_setattr("_source_ref", ref(instance))
+            set_source_t()
+
+
+class Source(ExplicitReinitSingleton):
+    def __init__(self) -> None:
+        self.x = [1]
+
+
+def bytes_per_object(make, n: int = 10_000) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [make() for _ in range(n)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    # vvv the list holding the objects
+    allocated -= objects.__sizeof__()
+    return allocated / n
+
+
+def main() -> None:
+    source = Source()
+    x = source.x
+    pairs = (
+        ("strong", LegacyRef, SingletonInstanceFieldRef),
+        ("weak", LegacyRefWeak, SingletonInstanceFieldRefWeak),
+    )
+
+    for kind, legacy_cls, cls in pairs:
+        legacy, new = legacy_cls(source, x), cls(source, x)
+
+        baseline = time_per_call(lambda: legacy_cls(source, x))
+        print_row(f"{kind} ref construction, dataclass", baseline)
+        t = time_per_call(lambda: cls(source, x))
+        print_row(f"{kind} ref construction, __slots__", t, baseline=baseline)
+
+        baseline = time_per_call(legacy, number=1_000_000)
+        print_row(f"{kind} ref unwrap, dataclass", baseline)
+        t = time_per_call(new, number=1_000_000)
+        print_row(f"{kind} ref unwrap, __slots__", t, baseline=baseline)
+
+        baseline = bytes_per_object(lambda: legacy_cls(source, x))
+        print_row(f"{kind} ref memory, dataclass", baseline, unit="B")
+        size = bytes_per_object(lambda: cls(source, x))
+        print_row(f"{kind} ref memory, __slots__", size, unit="B", baseline=baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Throughput of `ConcurrentRegistry` under contention - readers and writers
+hammering one registry - compared with a registry that locks reads as well,
+and bulk operations compared with per-item loops.
+"""
+
+from threading import Barrier, Thread
+from time import perf_counter
+
+from safe_singleton.utils.registry import ConcurrentRegistry, Registry
+
+from benchmarks._utils import print_row, time_per_call
+
+
+N_THREADS = 8
+N_OPS = 50_000
+# every n-th operation of a thread is a write
+WRITE_EVERY = 20
+N_BULK = 100_000
+
+
+class FullyLockedRegistry(ConcurrentRegistry):
+    # reads take the writers' lock, so they exclude writers and each other
+
+    def __getitem__(self, key):
+        with self._lock:
+            return super().__getitem__(key)
+
+    def get(self, key, default=None, /):
+        with self._lock:
+            return super().get(key, default)
+
+
+def contended_throughput(registry: Registry) -> float:
+    keys = [f"key-{i}" for i in range(1_000)]
+    registry.update((k, k) for k in keys)
+    barrier = Barrier(N_THREADS + 1)
+
+    def run(thread_id: int) -> None:
+        own_key = f"thread-{thread_id}"
+        get = registry.get
+        barrier.wait()
+
+        for i in range(N_OPS):
+            if i % WRITE_EVERY:
+                get(keys[i % len(keys)])
+            elif registry.try_unregister(own_key) is None:
+                registry.try_register(own_key, i)
+
+    threads = [Thread(target=run, args=(i,)) for i in range(N_THREADS)]
+
+    for t in threads:
+        t.start()
+
+    barrier.wait()
+    start = perf_counter()
+
+    for t in threads:
+        t.join()
+
+    return N_THREADS * N_OPS / (perf_counter() - start)
+
+
+def bulk_vs_loop(cls: type[Registry]) -> None:
+    items = [(i, i) for i in range(N_BULK)]
+    keys = [k for k, _ in items]
+
+    def register_loop():
+        registry = cls()
+        for k, v in items:
+            registry.register(k, v)
+
+    loop = time_per_call(register_loop, number=1, repeat=5) / 1e6
+    bulk = time_per_call(lambda: cls().register_many(items), number=1, repeat=5) / 1e6
+    print_row(f"{cls.__name__} register loop ({N_BULK})", loop, unit="ms")
+    print_row(f"{cls.__name__}.register_many", bulk, unit="ms", baseline=loop)
+
+    registry = cls(items)
+    get_loop = lambda: [registry.get(k) for k in keys]
+    loop = time_per_call(get_loop, number=1, repeat=5) / 1e6
+    bulk = time_per_call(lambda: registry.get_many(keys), number=1, repeat=5) / 1e6
+    print_row(f"{cls.__name__} get loop ({N_BULK})", loop, unit="ms")
+    print_row(f"{cls.__name__}.get_many", bulk, unit="ms", baseline=loop)
+
+
+def main() -> None:
+    baseline = contended_throughput(FullyLockedRegistry()) / 1e6
+    print_row("locked reads and writes", baseline, unit="Mops/s")
+    throughput = contended_throughput(ConcurrentRegistry()) / 1e6
+    print_row("ConcurrentRegistry", throughput, unit="Mops/s", baseline=baseline)
+
+    for cls in (Registry, ConcurrentRegistry):
+        registry = cls()
+        register = lambda: registry.register("key", 1, force=True)
+        print_row(f"{cls.__name__}.register", time_per_call(register))
+        getitem = lambda: registry["key"]
+        print_row(f"{cls.__name__}.__getitem__", time_per_call(getitem))
+
+    for cls in (Registry, ConcurrentRegistry):
+        bulk_vs_loop(cls)
+
+
+if __name__ == "__main__":
+    main()
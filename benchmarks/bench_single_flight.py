@@ -0,0 +1,65 @@
+"""
+Contention benchmark of the single-flight instance creation - many threads
+racing on a cold singleton with an expensive constructor, followed by
+the uncontended fast path on the existing instance.
+"""
+
+from threading import Barrier, Thread
+from time import perf_counter, sleep
+
+from safe_singleton.more import NoImplicitReinitSingleton, SimpleSingleton
+
+from benchmarks._utils import print_row, time_per_call
+
+
+N_THREADS = 32
+N_ROUNDS = 20
+INIT_DURATION = 0.005
+
+
+def race_on_cold_singleton(base: type[SimpleSingleton]) -> tuple[float, int]:
+    inits = 0
+
+    class Expensive(base):  # type: ignore
+        def __init__(self) -> None:
+            nonlocal inits
+            inits += 1
+            sleep(INIT_DURATION)
+
+    barrier = Barrier(N_THREADS)
+    run = lambda: (barrier.wait(), Expensive())
+    threads = [Thread(target=run) for _ in range(N_THREADS)]
+
+    start = perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    return perf_counter() - start, inits
+
+
+def main() -> None:
+    for base in (SimpleSingleton, NoImplicitReinitSingleton):
+        elapsed = 0.0
+        inits = 0
+
+        for _ in range(N_ROUNDS):
+            round_elapsed, round_inits = race_on_cold_singleton(base)
+            elapsed += round_elapsed
+            inits += round_inits
+
+        name = f"{base.__name__} cold race ({N_THREADS} threads)"
+        print_row(name, elapsed / N_ROUNDS * 1e3, unit="ms")
+        print_row(f"{base.__name__} constructions per race", inits / N_ROUNDS, unit="")
+
+    class Warm(SimpleSingleton):
+        ...
+
+    Warm()
+    print_row("SimpleSingleton() on existing instance", time_per_call(Warm))
+    print_row("SimpleSingleton.get_instance()", time_per_call(Warm.get_instance))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Micro-benchmarks of every singleton tier compared with a plain object
+baseline. Pass `--output results.json` to store machine-readable results, so
+that they can be compared between releases.
+"""
+
+import json
+import platform
+from argparse import ArgumentParser
+from collections.abc import Callable
+from typing import Any
+
+from safe_singleton.more import (
+    EnsureInitSingleton,
+    EnsureInitWeakRefSingleton,
+    ExplicitReinitSingleton,
+    ExplicitReinitWeakRefSingleton,
+    NoImplicitReinitSingleton,
+    NoImplicitReinitWeakRefSingleton,
+    SimpleSingleton,
+    SimpleWeakRefSingleton,
+)
+
+from benchmarks._utils import print_row, time_per_call
+
+
+TIERS = (
+    SimpleSingleton,
+    NoImplicitReinitSingleton,
+    ExplicitReinitSingleton,
+    EnsureInitSingleton,
+    SimpleWeakRefSingleton,
+    NoImplicitReinitWeakRefSingleton,
+    ExplicitReinitWeakRefSingleton,
+    EnsureInitWeakRefSingleton,
+)
+
+Case = Callable[[], object]
+
+
+class Plain:
+    def __init__(self) -> None:
+        self.x = 1
+
+
+def make_concrete(tier: type[SimpleSingleton]) -> type[SimpleSingleton]:
+    class Concrete(tier):  # type: ignore
+        def __init__(self) -> None:
+            self.x = 1
+
+    return Concrete
+
+
+def reset(cls: type[SimpleSingleton]) -> None:
+    if (unregister := getattr(cls, "_unregister_instance", None)) is not None:
+        unregister()
+    else:
+        cls._instance = None
+
+
+def plain_cases() -> dict[str, Callable[[], Case]]:
+    instance = Plain()
+
+    return {
+        "construction": lambda: Plain,
+        "get_instance": lambda: lambda: instance,
+        "maybe_get_instance": lambda: lambda: instance,
+        "repeated __new__": lambda: Plain,
+        "attribute access": lambda: lambda: instance.x,
+    }
+
+
+def tier_cases(tier: type[SimpleSingleton]) -> dict[str, Callable[[], Case]]:
+    """
+    Returns factories of the cases, they are called right before the case is
+    timed, because some cases invalidate the instance.
+    """
+
+    cls = make_concrete(tier)
+
+    def with_instance(case_builder: Callable[[Any], Case]) -> Callable[[], Case]:
+        def case_factory() -> Case:
+            # weakref singletons need a hard reference (held by the case) to
+            # stay alive
+            instance = cls.maybe_get_instance() or cls()
+            return case_builder(instance)
+
+        return case_factory
+
+    cases: dict[str, Callable[[], Case]] = {
+        "construction": lambda: lambda: (reset(cls), cls()),
+        "get_instance": with_instance(lambda i: lambda: (i, cls.get_instance())),
+        "maybe_get_instance": with_instance(
+            lambda i: lambda: (i, cls.maybe_get_instance())
+        ),
+    }
+
+    if not issubclass(cls, NoImplicitReinitSingleton):
+        cases["repeated __new__"] = with_instance(lambda i: lambda: (i, cls()))
+
+    cases["attribute access"] = with_instance(lambda i: lambda: i.x)
+
+    if issubclass(cls, ExplicitReinitSingleton):
+        # vvv the result is discarded, so weakref singletons die right away
+        cases["reinit"] = lambda: cls.reinit
+
+    return cases
+
+
+def run(number: int) -> list[dict[str, Any]]:
+    results = []
+    baselines = {}
+
+    for operation, case_factory in plain_cases().items():
+        ns = time_per_call(case_factory(), number=number)
+        baselines[operation] = ns
+        results.append(
+            {"tier": "plain", "operation": operation, "ns": ns, "ratio": 1.0}
+        )
+        print_row(f"plain / {operation}", ns)
+
+    for tier in TIERS:
+        for operation, case_factory in tier_cases(tier).items():
+            ns = time_per_call(case_factory(), number=number)
+            baseline = baselines.get(operation)
+            ratio = ns / baseline if baseline else None
+            result = {"tier": tier.__name__, "operation": operation}
+            results.append(result | {"ns": ns, "ratio": ratio})
+            print_row(f"{tier.__name__} / {operation}", ns, baseline=baseline)
+
+    return results
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--output", help="path of the JSON results file")
+    parser.add_argument("--number", type=int, default=20_000)
+    args = parser.parse_args()
+
+    results = run(args.number)
+
+    if args.output:
+        report = {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "number": args.number,
+            "results": results,
+        }
+
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
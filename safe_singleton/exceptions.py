@@ -95,3 +95,16 @@ class CriticalUnregisterError(SingletonError):
     def __post_init__(self) -> None:
         self.reason = f"caused by following errors: {self.errors}"
         super().__post_init__()
+
+
+@final
+class ResetAllError(PrettyError):
+    """
+    Raised by `reset_all`, when discarding instances of more than one class has
+    failed.
+    """
+
+    # vvv `PureAbcMeta` wraps `__init__` before `dataclass` could generate it
+    def __init__(self, errors: tuple[Exception, ...]) -> None:
+        super().__init__(f"resetting singletons failed: {errors}")
+        self.errors = errors
@@ -1,6 +1,9 @@
+from collections.abc import Callable
 from contextlib import suppress
 from dataclasses import dataclass, field
-from functools import wraps
+from functools import partial, wraps
+from threading import Lock
+from time import perf_counter
 from typing import Any, ClassVar, Generic, Protocol, TypeVar
 
 from typing_extensions import Self
@@ -9,7 +12,7 @@ from weakref import ReferenceType, ref
 from safe_singleton.utils.context import set_del_attr
 
 from ..exceptions import ImplicitReinitError
-from ..utils.registry import Registry
+from ..utils.registry import ConcurrentRegistry, Registry
 from ..utils.registry.exceptions import AlreadyRegisteredError, NotRegisteredError
 from .exceptions import (
     GetInstanceError,
@@ -36,17 +39,96 @@ class SingletonRegistry(Generic[_T]):
     _BYPASS_MEMORIZE_DUNDER: ClassVar[str] = "__singleton_bypass_memorize__"
 
     _memory: Registry[type[_T], _T] = field(default_factory=Registry)
+    _factories: ConcurrentRegistry[type[_T], Callable[[], _T]] = field(
+        init=False, default_factory=ConcurrentRegistry
+    )
+    _names: ConcurrentRegistry[str, type[_T]] = field(
+        init=False, default_factory=ConcurrentRegistry
+    )
+    _factory_locks: dict[type[_T], Lock] = field(init=False, default_factory=dict)
+    _factory_timings: dict[type[_T], float] = field(init=False, default_factory=dict)
+
+    def get_instance(self, cls: type[_T] | str) -> _T:
+        """
+        `cls` can also be a name given to `register_factory`. Instances of
+        classes with registered factories are built on the first call.
+        """
+
+        cls = self._resolve(cls)
 
-    def get_instance(self, cls: type[_T]) -> _T:
         try:
             return self._recall(cls)
-        except NotRegisteredError as e:
-            raise GetInstanceError(cls) from e
+        except (NotRegisteredError, GetInvalidatedInstanceError) as e:
+            if cls in self._factories:
+                return self._build(cls)
+            elif isinstance(e, GetInstanceError):
+                raise
+            else:
+                raise GetInstanceError(cls) from e
 
     def register(self, cls: type[_T]) -> Self:
         self._wrap_init(cls)
         return self
 
+    def register_factory(
+        self,
+        cls: type[_T],
+        factory: Callable[[], _T] | None = None,
+        *,
+        name: str | None = None,
+    ) -> Self:
+        """
+        Registers a zero-argument factory (`cls` by default), which is called
+        to build the instance on the first `get_instance` call. The class can
+        be looked up by `name` as well (its qualified name by default).
+        """
+
+        name = cls.__qualname__ if name is None else name
+        self._names.register(name, cls)
+
+        try:
+            self._factories.register(cls, cls if factory is None else factory)
+        except AlreadyRegisteredError:
+            self._names.unregister(name)
+            raise
+
+        self._factory_locks.setdefault(cls, Lock())
+        return self
+
+    @property
+    def factory_timings(self) -> dict[type[_T], float]:
+        """
+        Construction times (in seconds) of instances built by factories.
+        """
+
+        return dict(self._factory_timings)
+
+    def _resolve(self, cls: type[_T] | str) -> type[_T]:
+        if not isinstance(cls, str):
+            return cls
+
+        try:
+            return self._names[cls]
+        except KeyError:
+            # vvv the same error as for an unknown class
+            raise GetInstanceError(cls) from NotRegisteredError(cls)
+
+    def _build(self, cls: type[_T]) -> _T:
+        with self._factory_locks[cls]:
+            # vvv another thread might have been first
+            with suppress(NotRegisteredError, GetInvalidatedInstanceError):
+                return self._recall(cls)
+
+            start = perf_counter()
+            instance = self._factories[cls]()
+            self._factory_timings[cls] = perf_counter() - start
+
+            # a class registered with `register` memorizes itself on init
+            if cls not in self._memory:
+                self._memorize(cls, instance)
+
+            return instance
+
     def _wrap_init(self, cls: type[_T]) -> None:
         original_init = cls.__init__
 
@@ -60,13 +142,16 @@ class SingletonRegistry(Generic[_T]):
             except AlreadyRegisteredError as e:
                 raise ImplicitReinitError(cls) from e
 
-        setattr(cls, original_init.__name__, original_init)
+        setattr(cls, original_init.__name__, __init__)
 
     def _memorize(self, cls: type[_T], instance: _T) -> None:
         self._memory.register(cls, instance)
 
     def _recall(self, cls: type[_T]) -> _T:
-        return self._memory[cls]
+        try:
+            return self._memory[cls]
+        except KeyError as e:
+            raise NotRegisteredError(cls) from e
 
     @classmethod
     def _memorization_bypassed(cls, _cls: type[_T]) -> bool:
@@ -75,23 +160,69 @@ class SingletonRegistry(Generic[_T]):
 
 @dataclass
 class SingletonWeakRegistry(SingletonRegistry, Generic[_T]):
+    # Entries are dropped soon after their instances die. Weakref callbacks may
+    # be called from any thread, also by the garbage collector in the middle of
+    # a locked write, so they only queue the dead references (like
+    # `WeakValueDictionary` does) - those are purged on the next read or write.
     _memory: Registry[type[_T], ReferenceType[_T]] = field(
-        init=False, default_factory=Registry
+        init=False, default_factory=ConcurrentRegistry
+    )
+    _pending_removals: list[tuple[type[_T], ReferenceType[_T]]] = field(
+        init=False, default_factory=list
     )
+    _purge_lock: Lock = field(init=False, default_factory=Lock)
+    _purge_count: int = field(init=False, default=0)
+
+    @property
+    def size(self) -> int:
+        self._purge()
+        return len(self._memory)
+
+    @property
+    def purge_count(self) -> int:
+        """
+        Number of entries dropped, because their instances have died.
+        """
+
+        self._purge()
+        return self._purge_count
 
     def _memorize(self, cls: type[_T], instance: _T) -> None:
-        self._memory.register(cls, ref(instance))
+        self._purge()
+        self._memory.register(cls, ref(instance, partial(self._forget, cls)))
 
     def _recall(self, cls: type[_T]) -> _T:
-        instance_ref = self._memory[cls]
+        self._purge()
+
+        try:
+            instance_ref = self._memory[cls]
+        except KeyError as e:
+            raise NotRegisteredError(cls) from e
+
         if (instance := instance_ref()) is None:
-            # forget about the class if its instance does not exist
-            with suppress(NotRegisteredError):
-                self._memory.unregister(cls)
+            # the callback has not been called yet
+            self._forget(cls, instance_ref)
+            self._purge()
             raise GetInvalidatedInstanceError(cls)
         else:
             return instance
 
+    def _forget(self, cls: type[_T], instance_ref: ReferenceType[_T]) -> None:
+        # vvv atomic, no lock is taken here
+        self._pending_removals.append((cls, instance_ref))
+
+    def _purge(self) -> None:
+        if not self._pending_removals:
+            return
+
+        with self._purge_lock:
+            while self._pending_removals:
+                cls, instance_ref = self._pending_removals.pop()
+
+                # vvv the class might have been registered again in the meantime
+                if self._memory.try_unregister_value(cls, instance_ref):
+                    self._purge_count += 1
+
 
 __GLOBAL_SINGLETON_REGISTRY = SingletonRegistry()
 __GLOBAL_WEAK_SINGLETON_REGISTRY = SingletonWeakRegistry()
@@ -109,6 +240,19 @@ def register(
     return register_decorator
 
 
+def register_factory(
+    cls: type[_T],
+    factory: Callable[[], _T] | None = None,
+    registry: SingletonRegistry | None = None,
+    *,
+    name: str | None = None,
+    weak_registry: bool = False,
+) -> type[_T]:
+    registry = _dispatch_registry(registry, weak=weak_registry)
+    registry.register_factory(cls, factory, name=name)
+    return cls
+
+
 def reinit(
     cls: type[_T],
     args: tuple = (),
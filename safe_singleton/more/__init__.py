@@ -10,10 +10,40 @@ from ._base import (
     EnsureInitSingleton,
     abstract_singleton,
 )
-from ._meta import SingletonMeta, abstract_singleton
+from ._meta import (
+    SingletonMeta,
+    abstract_singleton,
+    live_singletons,
+    reset_all,
+    singleton_classes,
+)
 from ._weakref_singletons import (
     SimpleWeakRefSingleton,
     NoImplicitReinitWeakRefSingleton,
     ExplicitReinitWeakRefSingleton,
     EnsureInitWeakRefSingleton,
 )
+from ._thread_local import (
+    ThreadLocalSingleton,
+    ThreadLocalExplicitReinitSingleton,
+)
+from ._context import (
+    ContextSingleton,
+    ContextExplicitReinitSingleton,
+    singleton_scope,
+)
+from ._multiton import EvictionPolicy, Multiton
+from ._ttl import RefreshPolicy, TTLSingleton
+from ._auto_wrap import SingletonFieldProxy, auto_wrap_fields
+from ._fork import ForkPolicy, fork_policy
+from ._shared_memory import SharedStateSingleton
+from ._instrumentation import (
+    SingletonStats,
+    collect_stats,
+    disable_instrumentation,
+    enable_instrumentation,
+    get_stats,
+    is_instrumentation_enabled,
+    reset_stats,
+)
+from ._warmup import WarmUpReport, awarm_up, depends_on, warm_up
@@ -0,0 +1,211 @@
+"""
+Automatic invalidation of singleton instances' fields - instead of calling
+`wrap_attr` and `forward_ref` by hand, fields of classes decorated with
+`auto_wrap_fields` are read through cached, invalidation-aware proxies.
+"""
+
+from collections.abc import Callable, Hashable, Iterator
+from functools import wraps
+from typing import Any, Generic, TypeVar, final
+
+from ..utils.decorators import ensure_subcls_on_arg
+from ._base import ExplicitReinitSingleton, SingletonInstanceFieldRefWeak, _unshadowed
+
+
+T = TypeVar("T")
+_ExpReinitSingClsT = TypeVar("_ExpReinitSingClsT", bound=type[ExplicitReinitSingleton])
+
+# values of these types are returned as they are
+_PLAIN_TYPES = (int, float, complex, str, bytes, bool, type(None))
+_MISSING = object()
+_object_setattr = object.__setattr__
+
+
+def auto_wrap_fields(
+    depth: int = 1,
+) -> Callable[[_ExpReinitSingClsT], _ExpReinitSingClsT]:
+    """
+    Fields of the decorated class' instances are read as `SingletonFieldProxy`s
+    that raise `InvalidationError` once the instance gets discarded (e.g. by
+    `reinit`). With `depth` above 1, attributes and items of the fields are
+    wrapped as well, `depth - 1` levels down. Plain scalars and callables are
+    never wrapped.
+
+    Fields are those set on the instance by `__init__`. Proxies are created on
+    the first access and cached - there is at most one per field of an
+    instance, so per generation.
+    """
+
+    @ensure_subcls_on_arg(ExplicitReinitSingleton)
+    def auto_wrap_fields_decorator(cls: _ExpReinitSingClsT) -> _ExpReinitSingClsT:
+        init = cls.__init__
+
+        @wraps(init)
+        def __init__(self, *args, **kwds) -> None:
+            init(self, *args, **kwds)
+            _install_field_descriptors(_unshadowed(type(self)), self)
+
+        cls.__init__ = __init__
+        cls.__singleton_auto_wrap_depth__ = depth
+        return cls
+
+    return auto_wrap_fields_decorator
+
+
+@final
+class SingletonFieldProxy(Generic[T]):
+    """
+    Forwards attribute and item access to a singleton instance's field value.
+    Raises `InvalidationError` once the instance is discarded. Iteration
+    yields unwrapped values and `isinstance` checks see the proxy, not the
+    value.
+    """
+
+    __slots__ = ("_ref", "_depth", "_children")
+
+    _ref: SingletonInstanceFieldRefWeak[Any, T]
+    _depth: int
+    # proxies of nested values by ("attr", name) or ("item", key)
+    _children: dict[tuple[str, Hashable], "SingletonFieldProxy"] | None
+
+    def __init__(self, ref: SingletonInstanceFieldRefWeak[Any, T], depth: int) -> None:
+        _object_setattr(self, "_ref", ref)
+        _object_setattr(self, "_depth", depth)
+        _object_setattr(self, "_children", None)
+
+    def __getattr__(self, name: str) -> Any:
+        return self._wrap_child(("attr", name), getattr(self._ref(), name))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._ref(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self._ref(), name)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._wrap_child(("item", key), self._ref()[key])
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._ref()[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        del self._ref()[key]
+
+    def __len__(self) -> int:
+        return len(self._ref())
+
+    def __iter__(self) -> Iterator:
+        return iter(self._ref())
+
+    def __contains__(self, x: Any) -> bool:
+        return x in self._ref()
+
+    def __bool__(self) -> bool:
+        return bool(self._ref())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SingletonFieldProxy):
+            other = other._ref()
+
+        return self._ref() == other
+
+    def __hash__(self) -> int:
+        return hash(self._ref())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._ref()!r})"
+
+    def _wrap_child(self, key: tuple[str, Any], value: Any) -> Any:
+        if self._depth <= 1 or not _is_wrappable(value):
+            return value
+
+        if (children := self._children) is None:
+            children = {}
+            _object_setattr(self, "_children", children)
+
+        try:
+            child = children.get(key)
+        except TypeError:
+            # vvv unhashable item key, such a proxy is not cached
+            return SingletonFieldProxy(self._ref.forward_ref(value), self._depth - 1)
+
+        if child is None or child._ref._wrapped is not value:
+            child = SingletonFieldProxy(self._ref.forward_ref(value), self._depth - 1)
+            children[key] = child
+
+        return child
+
+
+class _AutoWrappedField:
+    """
+    Data descriptor that replaces a field of an `auto_wrap_fields` class. The
+    value stays in the instance's `__dict__`.
+    """
+
+    __slots__ = ("name", "default")
+
+    def __init__(self, name: str, default: Any) -> None:
+        self.name = name
+        # the class attribute that has been shadowed by the field, if any
+        self.default = default
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            return self if self.default is _MISSING else self.default
+
+        fields = instance.__dict__
+
+        try:
+            value = fields[self.name]
+        except KeyError:
+            if (value := self.default) is _MISSING:
+                raise AttributeError(self.name) from None
+
+        # vvv the hot path - the cached proxy is still up to date
+        proxies = fields.get("__singleton_field_proxies__")
+
+        if proxies is not None and (proxy := proxies.get(self.name)) is not None:
+            if proxy._ref._wrapped is value:
+                return proxy
+
+        if not _is_wrappable(value):
+            return value
+
+        return _create_field_proxy(instance, self.name, value)
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        instance.__dict__[self.name] = value
+
+    def __delete__(self, instance: Any) -> None:
+        try:
+            del instance.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+
+def _is_wrappable(value: Any) -> bool:
+    return not isinstance(value, _PLAIN_TYPES) and not callable(value)
+
+
+def _install_field_descriptors(cls: type, instance: Any) -> None:
+    for name in vars(instance):
+        if name.startswith("__"):
+            continue
+
+        attr = next(
+            (klass.__dict__[name] for klass in cls.__mro__ if name in klass.__dict__),
+            _MISSING,
+        )
+
+        # vvv already installed (maybe on a base class) or a property etc.
+        if hasattr(attr, "__get__"):
+            continue
+
+        setattr(cls, name, _AutoWrappedField(name, attr))
+
+
+def _create_field_proxy(instance: Any, name: str, value: Any) -> SingletonFieldProxy:
+    ref = SingletonInstanceFieldRefWeak(instance, value)
+    proxy = SingletonFieldProxy(ref, type(instance).__singleton_auto_wrap_depth__)
+    instance.__dict__.setdefault("__singleton_field_proxies__", {})[name] = proxy
+    return proxy
@@ -1,6 +1,9 @@
+import asyncio
 from abc import ABC, abstractmethod
-from collections.abc import Callable
-from dataclasses import dataclass, field
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager, suppress
+from dataclasses import FrozenInstanceError
 from functools import wraps
 from typing import Any, ClassVar, Generic, TypeGuard, TypeVar, final
 from weakref import ReferenceType, ref
@@ -15,15 +18,19 @@ from ..exceptions import (
     NoAttrError,
     NoInstanceError,
 )
-from ._meta import SingletonMeta, abstract_singleton
+from . import _instrumentation
+from ._meta import _GENERATIONS, SingletonMeta, abstract_singleton
 from ..utils import raise_if
-from ..utils.context import at_exit, set_del_attr
+from ..utils.concurrency import run_in_thread
+from ..utils.context import set_del_attr
 from ..utils.decorators import ensure_subcls_on_arg
 from ..utils.functional import call_chain
 
 
 T = TypeVar("T")
 ClsFlag = ClassVar[bool]
+_SimpleSingT = TypeVar("_SimpleSingT", bound="SimpleSingleton")
+_ExpReinitSingT = TypeVar("_ExpReinitSingT", bound="ExplicitReinitSingleton")
 
 
 @abstract_singleton
@@ -50,6 +57,47 @@ class SimpleSingleton(ABC, metaclass=SingletonMeta):
     def instance_exists(cls) -> bool:
         return cls.maybe_get_instance() is not None
 
+    @classmethod
+    def lazy(cls, *args, **kwds) -> Self:
+        """
+        Returns the instance. If there is none, registers a new one, that will
+        be initialized with given arguments on its first attribute access. From
+        then on, it is a regular instance - there is no proxy in between. If
+        the initialization fails, the next access tries again.
+        """
+
+        if (instance := cls.maybe_get_instance()) is not None:
+            return instance
+
+        with cls._instance_lock:
+            if (instance := cls.maybe_get_instance()) is not None:
+                return instance
+
+            instance = cls.__new__(cls, *args, **kwds)
+            cls._instance_lazy_args = (args, kwds)
+            instance.__class__ = _get_lazy_cls(cls)
+            return instance
+
+    @classmethod
+    async def aget_instance(cls, *args, **kwds) -> Self:
+        """
+        Async counterpart of `get_instance` and `__new__` - returns the instance
+        or creates it with `_acreate_instance`, if there is none. Concurrent
+        tasks await one shared creation.
+        """
+
+        if (creation := cls._instance_creation) is not None:
+            return await asyncio.shield(creation)
+        elif (instance := cls.maybe_get_instance()) is not None:
+            return instance
+
+        creation = asyncio.ensure_future(cls._acreate_instance(*args, **kwds))
+        cls._instance_creation = creation
+        creation.add_done_callback(cls._forget_instance_creation)
+
+        # vvv cancelling one of the waiters must not cancel the creation
+        return await asyncio.shield(creation)
+
     def __copy__(self) -> Self:
         return self
 
@@ -65,11 +113,37 @@ class SimpleSingleton(ABC, metaclass=SingletonMeta):
         if cls._is_abstract_singleton():
             raise AbstractSingletonInitError(cls)
 
-        if cls.instance_exists():
-            return cls._instance
+        if (instance := cls.maybe_get_instance()) is not None:
+            return instance
         else:
             return cls._create_and_register_new_instance(args, kwds)
 
+    @classmethod
+    async def _acreate_instance(cls, *args, **kwds) -> Self:
+        """
+        Override to build the instance asynchronously, e.g. to await resources
+        it wraps. Other `aget_instance` callers wait until it returns.
+        """
+
+        return cls(*args, **kwds)
+
+    @classmethod
+    def _forget_instance_creation(cls, creation: asyncio.Future) -> None:
+        if cls._instance_creation is creation:
+            cls._instance_creation = None
+
+    @classmethod
+    async def _await_instance_creation(cls) -> None:
+        if (creation := cls._instance_creation) is not None:
+            # the creation's failure is reported to its own waiters
+            with suppress(Exception):
+                await asyncio.shield(creation)
+
+    @classmethod
+    def _peek_instance(cls) -> Self | None:
+        # used by `SingletonMeta.__call__` to decide whether to take the lock
+        return cls.maybe_get_instance()
+
     @classmethod
     def _create_and_register_new_instance(cls, args: tuple, kwds: dict) -> Self:
         # This has to be done this way, because otherwise weakref singletons
@@ -98,6 +172,8 @@ class NoImplicitReinitSingleton(SimpleSingleton, ABC):
 
     def __new__(cls, *args, **kwds) -> Self:
         if cls.instance_exists():
+            if _instrumentation.enabled:
+                _instrumentation.record(cls, "implicit_reinit_errors")
             raise ImplicitReinitError(cls)
         else:
             return super().__new__(cls, *args, **kwds)
@@ -119,20 +195,97 @@ class ExplicitReinitSingleton(NoImplicitReinitSingleton, ABC):
     # ? maybe create another clas above that does not raise InvalidationError
 
     __singleton_no_raise_invalidation__: ClsFlag = False
+    # set while discarding instances inherited by a forked child, which must not
+    # release resources (e.g. sockets) still shared with the parent
+    __singleton_skip_teardown__: ClsFlag = False
+
+    # the last `reinit_async` call's, see `_reinit_detached`
+    _reinit_token: ClassVar[object | None] = None
+    _reinit_future: ClassVar[Future | None] = None
 
     @classmethod
     def reinit(cls, *args, **kwds) -> Self:
+        if _instrumentation.enabled:
+            _instrumentation.record(cls, "reinits")
+
         cls._unregister_instance()
         new_instance = cls(*args, **kwds)
         return new_instance
 
+    @classmethod
+    def reinit_async(cls, *args, **kwds) -> Future[Self]:
+        """
+        Non-blocking `reinit` - the new instance is built in a background thread
+        while the current one keeps being served, then it is swapped in. When
+        called again before that, only the last call's instance is swapped in
+        and the earlier futures resolve to it.
+        """
+
+        if _instrumentation.enabled:
+            _instrumentation.record(cls, "reinits")
+
+        with cls._instance_lock:
+            token = object()
+            cls._reinit_token = token
+            future = run_in_thread(cls._reinit_detached, token, args, kwds)
+            cls._reinit_future = future
+
+        return future
+
     @classmethod
     def invalidate_singleton(cls, raise_invalidation=False) -> None:
+        if _instrumentation.enabled:
+            _instrumentation.record(cls, "invalidations")
+
         cls._unregister_instance()
 
         if raise_invalidation:
             raise InvalidationError(cls)
 
+    @classmethod
+    async def areinit(cls, *args, **kwds) -> Self:
+        """
+        Async counterpart of `reinit`, the new instance is created with
+        `_acreate_instance`. Pending async creation is awaited first.
+        """
+
+        if _instrumentation.enabled:
+            _instrumentation.record(cls, "reinits")
+
+        await cls._await_instance_creation()
+        cls._unregister_instance()
+        return await cls.aget_instance(*args, **kwds)
+
+    @classmethod
+    async def ainvalidate_singleton(cls, raise_invalidation=False) -> None:
+        """
+        Async counterpart of `invalidate_singleton`. Pending async creation is
+        awaited first, so it does not get published after the invalidation.
+        """
+
+        await cls._await_instance_creation()
+        cls.invalidate_singleton(raise_invalidation)
+
+    @classmethod
+    @contextmanager
+    def lease(cls) -> Iterator[Self]:
+        """
+        Yields the current instance and keeps it usable until the block ends,
+        even if it gets discarded (e.g. by `reinit`) in the meantime - new
+        leases get the new instance. A discarded instance is torn down (see
+        `_teardown_instance`) and invalidated, once its last lease has ended.
+        """
+
+        with cls._instance_lock:
+            instance = cls.get_instance()
+            key = id(instance)
+            cls._instance_leases[key] = cls._instance_leases.get(key, 0) + 1
+
+        try:
+            yield instance
+        finally:
+            cls._release_lease(key)
+
     def is_instance_valid(self) -> bool:
         return id(self) == id(type(self).maybe_get_instance())
 
@@ -149,18 +302,135 @@ class ExplicitReinitSingleton(NoImplicitReinitSingleton, ABC):
         discarted.
         """
 
-        cls._instance = None
+        instance = cls.maybe_get_instance()
+        cls._drop_instance()
 
-    def __getattribute__(self, __name: str) -> Any:
-        cls = type(self)
+        if instance is not None:
+            cls._retire_instance(instance)
 
-        # avoids RecursionError
-        if __name == cls.is_instance_valid.__name__:
-            return object.__getattribute__(self, __name)
-        elif cls.__singleton_no_raise_invalidation__ or self.is_instance_valid():
-            return super().__getattribute__(__name)
-        else:
-            raise InvalidationError(cls)
+    @classmethod
+    def _build_detached_instance(cls, *args, **kwds) -> Self:
+        """
+        Creates and initializes a new instance without registering it, so the
+        current one keeps being served in the meantime, see `_swap_instance`.
+        """
+
+        instance = cls._new_detached_instance(args, kwds)
+        # Refs created by `__init__` are stamped with the generation published
+        # by `_swap_instance`, so they stay valid once the instance is current.
+        # It is reserved until then - callers that do not swap the instance in
+        # release it with `_discard_detached_instance`.
+        cls._detached_generations[id(instance)] = next(_GENERATIONS)
+
+        try:
+            instance.__init__(*args, **kwds)
+        except BaseException:
+            cls._discard_detached_instance(instance)
+            raise
+
+        return instance
+
+    @classmethod
+    def _discard_detached_instance(cls, instance: Self) -> None:
+        cls._detached_generations.pop(id(instance), None)
+
+    @classmethod
+    def _new_detached_instance(cls, args: tuple, kwds: dict) -> Self:
+        """
+        Counterpart of `__new__` for detached instances, which do not go through
+        it. Override to prepare the class for their initialization.
+        """
+
+        return cls._create_new_instance(args, kwds)
+
+    @classmethod
+    def _reinit_detached(cls, token: object, args: tuple, kwds: dict) -> Self:
+        instance = cls._build_detached_instance(*args, **kwds)
+
+        with cls._instance_lock:
+            if cls._reinit_token is token:
+                cls._reinit_token = None
+                return cls._swap_instance(instance)
+
+            latest = cls._reinit_future
+
+        cls._discard_detached_instance(instance)
+
+        # superseded by a later `reinit_async`
+        return latest.result()
+
+    @classmethod
+    def _swap_instance(cls, new_instance: Self) -> Self:
+        """
+        Registers `new_instance` in place of the current one, which gets
+        invalidated. There is no moment without an instance in between.
+        """
+
+        with cls._instance_lock:
+            old_instance = cls.maybe_get_instance()
+            cls._instance_lazy_args = None
+            cls._register_new_instance(new_instance)
+
+            # vvv reserved, if it has been built detached
+            if generation := cls._detached_generations.pop(id(new_instance), None):
+                cls._generation = generation
+            else:
+                cls._bump_generation()
+
+        if old_instance is not None and old_instance is not new_instance:
+            cls._retire_instance(old_instance)
+
+        return new_instance
+
+    @classmethod
+    def _teardown_instance(cls, instance: Self) -> None:
+        """
+        Override to release resources of a discarded instance. Called once its
+        last lease has ended, right before it gets invalidated.
+        """
+
+    @classmethod
+    def _release_lease(cls, key: int) -> None:
+        with cls._instance_lock:
+            # vvv missing, if the leases were dropped after a fork
+            if (count := cls._instance_leases.pop(key, 0) - 1) > 0:
+                cls._instance_leases[key] = count
+                return
+
+            instance = cls._draining_instances.pop(key, None)
+
+        if instance is not None:
+            cls._teardown_and_invalidate(instance)
+
+    @classmethod
+    def _retire_instance(cls, instance: Self) -> None:
+        """
+        Tears down and invalidates a discarded instance - right away or, if it
+        is leased, when its last lease ends.
+        """
+
+        with cls._instance_lock:
+            if id(instance) in cls._instance_leases:
+                cls._draining_instances[id(instance)] = instance
+                return
+
+        cls._teardown_and_invalidate(instance)
+
+    @classmethod
+    def _teardown_and_invalidate(cls, instance: Self) -> None:
+        try:
+            if not cls.__singleton_skip_teardown__:
+                cls._teardown_instance(instance)
+        finally:
+            cls._invalidate_instance(instance)
+
+    @classmethod
+    def _invalidate_instance(cls, instance: Self) -> None:
+        # Invalidation is enforced here, once, instead of on every attribute
+        # access - the discarded instance becomes a tombstone, so live
+        # instances do not pay anything for it.
+        if not cls.__singleton_no_raise_invalidation__:
+            instance.__class__ = _get_tombstone_cls(type(instance))
 
 
 @abstract_singleton
@@ -176,34 +446,57 @@ class EnsureInitSingleton(ExplicitReinitSingleton, ABC):
     __singleton_is_init_wrapped__: ClsFlag = False
 
     def __new__(cls, *args, **kwds) -> Self:
-        instance = super().__new__(*args, **kwds)
-
-        if not cls.__singleton_is_init_wrapped__ and cls.__singleton_ensure_init__:
-            cls._wrap_init()
+        instance = super().__new__(cls, *args, **kwds)
+        cls._ensure_init_wrapped()
+        return instance
 
+    @classmethod
+    def _new_detached_instance(cls, args: tuple, kwds: dict) -> Self:
+        instance = super()._new_detached_instance(args, kwds)
+        cls._ensure_init_wrapped()
         return instance
 
+    @classmethod
+    def _ensure_init_wrapped(cls) -> None:
+        # vvv flags are looked up in the class' own namespace, a wrapped (or
+        # initialized) base class does not make its subclasses so
+        is_init_wrapped = "__singleton_is_init_wrapped__" in cls.__dict__
+
+        if not is_init_wrapped and cls.__singleton_ensure_init__:
+            cls._wrap_init()
+
     @classmethod
     def _wrap_init(cls) -> None:
         super_init = cls.__base__.__init__
         child_init = cls.__init__
+        # `object.__init__` does not take any arguments
+        call_super_init = super_init is not object.__init__
 
         @wraps(cls.__init__)
         def __init__(self: Self, *args, **kwds) -> None:
             try:
-                if not cls.__singleton_initialized__:
+                initialized = cls.__dict__.get("__singleton_initialized__", False)
+
+                if call_super_init and not initialized:
                     super_init(self, *args, **kwds)
                 child_init(self, *args, **kwds)
             except Exception as e_init:
+                # vvv a detached instance, see `_build_detached_instance`
+                if cls.maybe_get_instance() is not self:
+                    raise
+
                 try:
                     cls._unregister_instance()
                 except Exception as e_unregister:
                     cls._critical_unregister_attempt(e_init, e_unregister)
                     raise e_unregister from e_init
 
+                raise
+
             type(self).__singleton_initialized__ = True
 
         cls.__init__ = __init__
+        cls.__singleton_is_init_wrapped__ = True
 
     @classmethod
     def _unregister_instance(cls) -> None:
@@ -232,6 +525,216 @@ class EnsureInitSingleton(ExplicitReinitSingleton, ABC):
             raise CriticalUnregisterError(cls, errors=(e_init, e_unregister)) from e
 
 
+# ******************************************************************************
+# * Shadow classes
+# ******************************************************************************
+
+# Instances are swapped to the classes below (and back) by `__class__`
+# assignment. Shadow classes subclass the original one without adding anything
+# to its layout, so `isinstance` checks keep working. Their
+# `__singleton_shadow_of__` is the original class (it is the class itself for
+# all others) and `__init_subclass__` hooks are not run for them.
+
+
+def _derive_shadow_cls(
+    cls: type[T], kind: str, namespace: dict[str, Any], meta: type | None = None
+) -> type[T]:
+    """
+    Returns (and caches) a shadow subclass of `cls` of given `kind`. With
+    `meta`, the shadow is created as its instance without being initialized by
+    it, so it does not get any per-class singleton state of its own.
+    """
+
+    cls = _unshadowed(cls)
+    cache_name = f"__singleton_{kind.lower()}__"
+
+    if (shadow := cls.__dict__.get(cache_name)) is not None:
+        return shadow
+
+    namespace = {
+        "__slots__": (),
+        "__module__": cls.__module__,
+        "__qualname__": f"{cls.__qualname__}.<{kind.lower()}>",
+        "__singleton_shadow_of__": cls,
+        **namespace,
+    }
+    name = f"{kind}{cls.__name__}"
+
+    with cls._instance_lock:
+        if (shadow := cls.__dict__.get(cache_name)) is not None:
+            return shadow
+
+        with _init_subclass_skipping_shadows(cls):
+            if meta is None:
+                shadow = type(cls)(name, (cls,), namespace)
+            else:
+                shadow = type.__new__(meta, name, (cls,), namespace)
+
+        setattr(cls, cache_name, shadow)
+
+    return shadow
+
+
+@contextmanager
+def _init_subclass_skipping_shadows(cls: type) -> Iterator[None]:
+    """
+    `type.__new__` always runs `__init_subclass__` of the new class' parent, e.g.
+    a plugin registry or a hook with required class keywords. While shadows are
+    created, the hook of `cls` is replaced by one that skips them - subclasses
+    defined in the meantime are initialized as usual.
+    """
+
+    own_hook = cls.__dict__.get("__init_subclass__")
+
+    def __init_subclass__(subcls: type, **kwds) -> None:
+        if "__singleton_shadow_of__" in subcls.__dict__:
+            return
+
+        if own_hook is not None:
+            own_hook.__get__(None, subcls)(**kwds)
+        else:
+            super(cls, subcls).__init_subclass__(**kwds)  # type: ignore
+
+    setattr(cls, "__init_subclass__", classmethod(__init_subclass__))
+
+    try:
+        yield
+    finally:
+        if own_hook is not None:
+            setattr(cls, "__init_subclass__", own_hook)
+        else:
+            delattr(cls, "__init_subclass__")
+
+
+def _unshadowed(cls: type[T]) -> type[T]:
+    return cls.__singleton_shadow_of__  # type: ignore
+
+
+# vvv attributes of invalidated instances that are still accessible
+_TOMBSTONE_PASSTHROUGH = frozenset(("__class__", "is_instance_valid"))
+
+
+def _tombstone_getattribute(self, __name: str) -> Any:
+    if __name in _TOMBSTONE_PASSTHROUGH:
+        return object.__getattribute__(self, __name)
+
+    cls = type(self).__singleton_shadow_of__
+
+    if _instrumentation.enabled:
+        _instrumentation.record(cls, "invalidated_accesses")
+
+    raise InvalidationError(cls)
+
+
+def _is_tombstone(instance: Any) -> bool:
+    return type(instance).__getattribute__ is _tombstone_getattribute
+
+
+def _get_tombstone_cls(cls: type[_ExpReinitSingT]) -> type[_ExpReinitSingT]:
+    """
+    Invalidated instances are swapped to this class.
+    """
+
+    return _derive_shadow_cls(
+        cls, "Invalidated", {"__getattribute__": _tombstone_getattribute}
+    )
+
+
+def _materialize_lazy_instance(instance: SimpleSingleton) -> None:
+    lazy_cls = type(instance)
+
+    # vvv another thread might have been first
+    if (cls := _unshadowed(lazy_cls)) is lazy_cls:
+        return
+
+    with cls._instance_lock:
+        if type(instance) is not lazy_cls:
+            return
+
+        # vvv discarded before initialization, e.g. by `reinit`
+        if cls.maybe_get_instance() is not instance:
+            instance.__class__ = cls
+            return
+
+        # vvv accessed by its own `__init__`, that is running right now
+        if (lazy_args := cls._instance_lazy_args) is None:
+            return
+
+        # The instance stays shadowed until `__init__` finishes, so other
+        # threads wait for it on the lock above instead of seeing a partially
+        # initialized instance.
+        args, kwds = lazy_args
+        cls._instance_lazy_args = None
+
+        try:
+            cls.__init__(instance, *args, **kwds)
+        except BaseException:
+            # vvv the next access tries again, unless discarded in the meantime
+            if cls.maybe_get_instance() is instance:
+                cls._instance_lazy_args = lazy_args
+            raise
+
+        # From now on, there is no overhead - it is a regular instance.
+        instance.__class__ = cls
+
+
+def _lazy_getattribute(self, __name: str) -> Any:
+    lazy_cls = type(self)
+    _materialize_lazy_instance(self)
+
+    if type(self) is lazy_cls:
+        # vvv still being initialized by this thread
+        return _unshadowed(lazy_cls).__getattribute__(self, __name)
+
+    return getattr(self, __name)
+
+
+def _lazy_init(self, *args, **kwds) -> None:
+    # explicit initialization of the pending instance (e.g. `SimpleSingleton`
+    # reinitializes its instance on each call)
+    _materialize_lazy_instance(self)
+    self.__init__(*args, **kwds)
+
+
+def _forward_setattr(cls: type, name: str, value: Any) -> None:
+    setattr(cls.__singleton_shadow_of__, name, value)
+
+
+def _forward_delattr(cls: type, name: str) -> None:
+    delattr(cls.__singleton_shadow_of__, name)
+
+
+# metaclasses of lazy shadow classes by the original ones
+_LAZY_METAS: dict[type, type] = {}
+
+
+def _get_lazy_meta(meta: type) -> type:
+    """
+    Lazy instances are initialized while they are still shadowed, so class
+    attributes accessed as `type(self).x` are forwarded to the original class.
+    """
+
+    if (lazy_meta := _LAZY_METAS.get(meta)) is None:
+        namespace = {"__setattr__": _forward_setattr, "__delattr__": _forward_delattr}
+        lazy_meta = type(f"Lazy{meta.__name__}", (meta,), namespace)
+        lazy_meta = _LAZY_METAS.setdefault(meta, lazy_meta)
+
+    return lazy_meta
+
+
+def _get_lazy_cls(cls: type[_SimpleSingT]) -> type[_SimpleSingT]:
+    """
+    Not yet initialized instances created by `lazy` are swapped to this class.
+    """
+
+    return _derive_shadow_cls(
+        cls,
+        "Lazy",
+        {"__getattribute__": _lazy_getattribute, "__init__": _lazy_init},
+        meta=_get_lazy_meta(type(_unshadowed(cls))),
+    )
+
+
 # ******************************************************************************
 # * Decorators
 # ******************************************************************************
@@ -244,7 +747,9 @@ _ExpIniSingClsT = TypeVar("_ExpIniSingClsT", bound=type[ExplicitReinitSingleton]
 def no_invalidation_error(cls: _ExpIniSingClsT) -> _ExpIniSingClsT:
     """
     Disables raising InvalidationError, instance validity can still be checked
-    with a method.
+    with a method. Discarded instances of such class are not swapped to
+    a tombstone, so their attribute access stays plain `object.__getattribute__`
+    for the whole lifetime.
     """
 
     cls.__singleton_no_raise_invalidation__ = True
@@ -272,18 +777,28 @@ _RefT = TypeVar("_RefT", bound="AbstractSingletonInstanceFieldRef")
 
 
 class AbstractSingletonInstanceFieldRef(ABC, Generic[_SourceT, T]):
-    def __init__(self, _source: ExplicitReinitSingleton, _wrapped) -> None:
-        super().__init__()
-        self._source = _source
-        self._wrapped = _wrapped
-        self._source_t = type(_source)
+    # Frozen and without `__dict__` - thousands of refs are created per request.
+    # Fields are set once, in `__init__`, with `object.__setattr__`.
+    __slots__ = ("_wrapped", "_source_t", "_generation")
+
+    # vvv compared, hashed and shown by `repr`
+    _fields: ClassVar[tuple[str, ...]]
+
+    _wrapped: T
+    _source_t: type[_SourceT]
+    # The source class' generation at the time the source was current (or
+    # `_STALE_GENERATION`, if it was not). It changes whenever the instance is
+    # discarded (e.g. by `reinit`), so checking validity is a single comparison.
+    _generation: int
 
     def __call__(self) -> T:
         """
         Unwraps `self` and returns underlying singleton's attribute.
         """
 
-        self._ensure_source_valid()
+        if self._generation != self._source_t._generation:
+            raise InvalidationError(self._source_t)
+
         return self._wrapped
 
     @abstractmethod
@@ -293,23 +808,45 @@ class AbstractSingletonInstanceFieldRef(ABC, Generic[_SourceT, T]):
         ...
 
     def is_source_valid(self, _: _SourceT | None = None) -> TypeGuard[_SourceT]:
-        return self._maybe_get_source() is not None
+        return self._generation == self._source_t._generation
 
     def __copy__(self) -> Self:
-        return type(self)(self._get_source(), self._wrapped)
+        return type(self)(self._get_source(), self._wrapped, self._generation)
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+
+        return self._field_values() == other._field_values()
+
+    def __hash__(self) -> int:
+        return hash(self._field_values())
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{name}={value!r}"
+            for name, value in zip(self._fields, self._field_values())
+        )
+        return f"{type(self).__name__}({fields})"
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
 
     @abstractmethod
     def _maybe_get_source(self) -> _SourceT | None:
         ...
 
     def _get_source(self) -> _SourceT:
-        if (source := self._maybe_get_source()) is None:
+        if not self.is_source_valid() or (source := self._maybe_get_source()) is None:
             raise InvalidationError(self._source_t)
         else:
             return source
 
     def _forward_ref_as(self, refcls: type[_RefT], x) -> _RefT:
-        return refcls(self._get_source(), x)
+        return refcls(self._get_source(), x, self._generation)
 
     def _ensure_source_valid(
         self, source: _SourceT | None = None
@@ -323,9 +860,26 @@ class AbstractSingletonInstanceFieldRef(ABC, Generic[_SourceT, T]):
 
         return True
 
+    def _field_values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self._fields)
+
+
+_object_setattr = object.__setattr__
+# generations are never negative, so refs stamped with this are never valid
+_STALE_GENERATION = -1
+
+
+def _stamp_generation(source: Any, source_t: type[_SourceT]) -> int:
+    if source is source_t._instance or source is source_t.maybe_get_instance():
+        return source_t._generation
+
+    # Detached instances (see `_build_detached_instance`) get the generation
+    # reserved for them, others (e.g. leased or `no_invalidation_error` ones
+    # that were discarded) are stale.
+    return source_t._detached_generations.get(id(source), _STALE_GENERATION)
+
 
 @final
-@dataclass(frozen=True)
 class SingletonInstanceFieldRef(
     AbstractSingletonInstanceFieldRef, Generic[_SourceT, T]
 ):
@@ -335,13 +889,32 @@ class SingletonInstanceFieldRef(
     This is NOT a weakref.ReferenceType!
     """
 
-    # This attribute exists only at init and during forwarding the reference
+    __slots__ = ("_source",)
+    _fields = ("_source", "_wrapped", "_generation")
+
     _source: _SourceT
-    _wrapped: T
-    _source_t: type[_SourceT] = field(init=False)
+
+    def __init__(
+        self, _source: _SourceT, _wrapped: T, _generation: int | None = None
+    ) -> None:
+        source_t = type(_source).__singleton_shadow_of__
+        _object_setattr(self, "_source", _source)
+        _object_setattr(self, "_wrapped", _wrapped)
+        _object_setattr(self, "_source_t", source_t)
+
+        if _generation is None:
+            # vvv the common case inlined, see `_stamp_generation`
+            if _source is source_t._instance:
+                _generation = source_t._generation
+            else:
+                _generation = _stamp_generation(_source, source_t)
+
+        _object_setattr(self, "_generation", _generation)
 
     def as_weak(self) -> "SingletonInstanceFieldRefWeak[_SourceT, T]":
-        return SingletonInstanceFieldRefWeak(self._source, self._wrapped)
+        return SingletonInstanceFieldRefWeak(
+            self._source, self._wrapped, self._generation
+        )
 
     def forward_ref(
         self, x: _ToForwardT
@@ -356,23 +929,38 @@ class SingletonInstanceFieldRef(
     def _maybe_get_source(self) -> _SourceT:
         return self._source
 
-    def __post_init__(self) -> None:
-        object.__setattr__(self, "_source_t", type(self._source))
-
 
 @final
-@dataclass(frozen=True)
 class SingletonInstanceFieldRefWeak(
     AbstractSingletonInstanceFieldRef, Generic[_SourceT, T]
 ):
-    _source: _SourceT
-    _wrapped: T
-    _source_ref: ReferenceType[_SourceT] = field(init=False)
+    # only a weak reference to the source is kept
+    __slots__ = ("_source_ref",)
+    _fields = ("_source_ref", "_wrapped", "_generation")
+
+    _source_ref: ReferenceType[_SourceT]
 
-    _source_t: type[_SourceT] = field(init=False)
+    def __init__(
+        self, _source: _SourceT, _wrapped: T, _generation: int | None = None
+    ) -> None:
+        source_t = type(_source).__singleton_shadow_of__
+        _object_setattr(self, "_source_ref", ref(_source))
+        _object_setattr(self, "_wrapped", _wrapped)
+        _object_setattr(self, "_source_t", source_t)
+
+        if _generation is None:
+            # vvv the common case inlined, see `_stamp_generation`
+            if _source is source_t._instance:
+                _generation = source_t._generation
+            else:
+                _generation = _stamp_generation(_source, source_t)
+
+        _object_setattr(self, "_generation", _generation)
 
     def as_strong(self) -> SingletonInstanceFieldRef[_SourceT, T]:
-        return SingletonInstanceFieldRef(self._get_source(), self._wrapped)
+        return SingletonInstanceFieldRef(
+            self._get_source(), self._wrapped, self._generation
+        )
 
     def forward_ref(
         self, x: _ToForwardT
@@ -381,19 +969,4 @@ class SingletonInstanceFieldRefWeak(
         return self._forward_ref_as(SingletonInstanceFieldRefWeak, x)
 
     def _maybe_get_source(self) -> _SourceT | None:
-        assert isinstance(self._source_ref, ReferenceType)
-        return self._source()
-
-    def __post_init__(self) -> None:
-        instance = self._source
-        cls = type(instance)
-
-        # this dataclass is frozen, hence we must use object.__setattr__
-        self_delattr = lambda name: object.__delattr__(self, name)
-        self_setattr = lambda name, val: object.__setattr__(self, name, val)
-        set_source_t = lambda: self_setattr("_source_t", cls)
-
-        # deleting the hard reference to the source
-        with at_exit(lambda: self_delattr("_source")):
-            self_setattr("_source_ref", ref(instance))
-            set_source_t()
+        return self._source_ref()
@@ -0,0 +1,133 @@
+"""
+Singletons with one instance per `contextvars.Context`, e.g. per asyncio task or
+request. Child tasks inherit the instance of the context they were started in.
+"""
+
+from abc import ABC
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar, Token
+from typing import Any
+
+from typing_extensions import Self
+
+from ._base import ExplicitReinitSingleton, SimpleSingleton, _is_tombstone
+from ._meta import _GENERATIONS, LocalSingletonMeta, abstract_singleton
+
+
+class ContextSingletonMeta(LocalSingletonMeta):
+    def __init__(cls, *args, **kwds) -> None:
+        name = cls.__qualname__
+        cls._instance_var = ContextVar(f"{name}._instance", default=None)
+        # vvv set before `SingletonMeta.__init__`, which sets the generation
+        cls._generation_var = ContextVar(f"{name}._generation", default=0)
+        super().__init__(*args, **kwds)
+
+    # Each context has its own generation, like its own instance - refs of an
+    # instance are invalidated only where it is discarded. Generations are
+    # unique, so a ref of one context's instance never matches another's.
+    @property
+    def _generation(cls) -> int:
+        return cls._generation_var.get()
+
+    @_generation.setter
+    def _generation(cls, value: int) -> None:
+        cls._generation_var.set(value)
+
+
+# the class, tokens of its instance and generation and the instance
+_ScopeEntry = tuple[type["ContextSingleton"], Token, Token, Any]
+# instances created within the innermost `singleton_scope`
+_scope: ContextVar[list[_ScopeEntry] | None] = ContextVar(
+    "singleton_scope", default=None
+)
+
+
+@abstract_singleton
+class ContextSingleton(SimpleSingleton, ABC, metaclass=ContextSingletonMeta):
+    """
+    See `SimpleSingleton`. Each context has its own instance, getting it costs
+    a `ContextVar.get`. Use `singleton_scope` to release all instances created
+    within a block at once.
+    """
+
+    @classmethod
+    def maybe_get_instance(cls) -> Self | None:
+        return cls._instance_var.get()
+
+    @classmethod
+    async def aget_instance(cls, *args, **kwds) -> Self:
+        # Instances are not shared between tasks, so there is no creation to
+        # share either. `_acreate_instance` is awaited directly - in a separate
+        # task it would register the instance in that task's context.
+        if (instance := cls.maybe_get_instance()) is not None:
+            return instance
+
+        return await cls._acreate_instance(*args, **kwds)
+
+    @classmethod
+    def _register_new_instance(cls, new_instance: Self) -> Self:
+        token = cls._instance_var.set(new_instance)
+        generation_token = cls._generation_var.set(next(_GENERATIONS))
+
+        if (scope := _scope.get()) is not None:
+            scope.append((cls, token, generation_token, new_instance))
+
+        return new_instance
+
+    @classmethod
+    def _drop_instance(cls) -> None:
+        # only the current context's one
+        cls._instance_var.set(None)
+        cls._instance_lazy_args = None
+        cls._bump_generation()
+
+    @classmethod
+    def _release_scoped_instance(cls, instance: Self) -> None:
+        """
+        Called for each instance created within `singleton_scope` at its end.
+        """
+
+
+@abstract_singleton
+class ContextExplicitReinitSingleton(ContextSingleton, ExplicitReinitSingleton, ABC):
+    """
+    See `ExplicitReinitSingleton`. `reinit` and `invalidate_singleton` affect
+    only the current context. Instances created within `singleton_scope` are
+    invalidated at its end.
+    """
+
+    @classmethod
+    def _release_scoped_instance(cls, instance: Self) -> None:
+        # vvv already discarded within the scope, e.g. by `reinit`
+        if _is_tombstone(instance) or id(instance) in cls._draining_instances:
+            return
+
+        cls._retire_instance(instance)
+
+
+@contextmanager
+def singleton_scope() -> Iterator[None]:
+    """
+    Context singletons' instances created within the block, also by tasks
+    started in it, are released at its end - the values from before the block
+    are restored and the instances of `ContextExplicitReinitSingleton`s are
+    invalidated. Scopes can be nested.
+    """
+
+    created: list[_ScopeEntry] = []
+    scope_token = _scope.set(created)
+
+    try:
+        yield
+    finally:
+        _scope.reset(scope_token)
+
+        for cls, token, generation_token, instance in reversed(created):
+            # vvv set in another context (e.g. of a child task), which is
+            # not the current one, or already reset
+            with suppress(ValueError, RuntimeError):
+                cls._instance_var.reset(token)
+                cls._generation_var.reset(generation_token)
+
+            cls._release_scoped_instance(instance)
@@ -0,0 +1,78 @@
+"""
+Fork awareness of singletons - what happens to the instance inherited by
+a child process is decided per class with `fork_policy` decorator.
+"""
+
+import os
+from collections.abc import Callable
+from enum import Enum
+from typing import Any, TypeVar
+
+from ..utils.context import set_del_attr
+from ..utils.decorators import ensure_subcls_on_arg
+from ._base import ExplicitReinitSingleton
+from ._meta import _reset_class_index_lock, singleton_classes
+
+
+_ExpReinitSingClsT = TypeVar("_ExpReinitSingClsT", bound=type[ExplicitReinitSingleton])
+
+
+class ForkPolicy(Enum):
+    # the instance is shared with the parent (copy-on-write)
+    KEEP = "keep"
+    # the instance is invalidated in the child
+    INVALIDATE = "invalidate"
+    # the instance is invalidated in the child and a new one is built there on
+    # its first use, see `SimpleSingleton.lazy`
+    REINIT = "reinit"
+
+
+def fork_policy(
+    policy: ForkPolicy, args: tuple = (), kwds: dict[str, Any] | None = None
+) -> Callable[[_ExpReinitSingClsT], _ExpReinitSingClsT]:
+    """
+    Sets what happens to the class' instance in a forked child process. `args`
+    and `kwds` are used to initialize the new instance with `ForkPolicy.REINIT`.
+    The policy is inherited by subclasses. Instances inherited from the parent
+    are not torn down in the child, see `_teardown_instance`.
+    """
+
+    @ensure_subcls_on_arg(ExplicitReinitSingleton)
+    def fork_policy_decorator(cls: _ExpReinitSingClsT) -> _ExpReinitSingClsT:
+        cls.__singleton_fork_policy__ = policy
+        cls.__singleton_fork_reinit_args__ = (args, kwds or {})
+        return cls
+
+    return fork_policy_decorator
+
+
+def _after_fork_in_child() -> None:
+    _reset_class_index_lock()
+
+    for cls in singleton_classes():
+        cls._after_fork()
+        # Leases of the parent's threads are never released here - instances
+        # discarded while leased are invalidated right away. Resources of
+        # instances inherited from the parent are still used by it, so they are
+        # not torn down in the child.
+        cls._instance_leases = {}
+        draining, cls._draining_instances = cls._draining_instances, {}
+
+        for instance in draining.values():
+            cls._invalidate_instance(instance)
+
+        policy = getattr(cls, "__singleton_fork_policy__", ForkPolicy.KEEP)
+
+        if policy is ForkPolicy.KEEP or not cls.instance_exists():
+            continue
+
+        with set_del_attr(cls, "__singleton_skip_teardown__", True):
+            cls._unregister_instance()
+
+        if policy is ForkPolicy.REINIT:
+            args, kwds = cls.__singleton_fork_reinit_args__
+            cls.lazy(*args, **kwds)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,79 @@
+"""
+Per-class counters and timings of singletons. Disabled by default - hot paths
+(getting the instance, attribute access) are never instrumented, only creation,
+reinitialization, invalidation and error paths check whether it is enabled.
+"""
+
+from dataclasses import dataclass, replace
+from threading import Lock
+from weakref import WeakKeyDictionary
+
+
+@dataclass
+class SingletonStats:
+    creations: int = 0
+    # wall time of `__new__` and `__init__` in seconds
+    construction_time: float = 0.0
+    reinits: int = 0
+    invalidations: int = 0
+    implicit_reinit_errors: int = 0
+    invalidated_accesses: int = 0
+    # instance creations after the previous weakly referenced one has died
+    weakref_recreations: int = 0
+
+
+# read directly by the instrumented code paths
+enabled = False
+
+_stats: WeakKeyDictionary[type, SingletonStats] = WeakKeyDictionary()
+_lock = Lock()
+
+
+def enable_instrumentation() -> None:
+    global enabled
+    enabled = True
+
+
+def disable_instrumentation() -> None:
+    """
+    Stops collecting, already collected stats are kept.
+    """
+
+    global enabled
+    enabled = False
+
+
+def is_instrumentation_enabled() -> bool:
+    return enabled
+
+
+def get_stats(cls: type) -> SingletonStats:
+    """
+    Returns a copy of the class' stats.
+    """
+
+    with _lock:
+        return replace(_stats.get(cls) or SingletonStats())
+
+
+def collect_stats() -> dict[type, SingletonStats]:
+    """
+    Returns copies of stats of all classes that have any.
+    """
+
+    with _lock:
+        return {cls: replace(stats) for cls, stats in _stats.items()}
+
+
+def reset_stats() -> None:
+    with _lock:
+        _stats.clear()
+
+
+def record(cls: type, name: str, amount: int | float = 1) -> None:
+    with _lock:
+        if (stats := _stats.get(cls)) is None:
+            stats = _stats[cls] = SingletonStats()
+
+        setattr(stats, name, getattr(stats, name) + amount)
+
@@ -1,8 +1,16 @@
 from abc import ABCMeta, abstractmethod
 from functools import wraps
-from typing import TypeVar
+from itertools import count
+from threading import Lock, RLock
+from time import perf_counter
+from typing import Any, TypeVar
+from weakref import WeakSet
 
-from ..exceptions import AbstractIsAbstractSingletonMethodNotImplementedError
+from ..exceptions import (
+    AbstractIsAbstractSingletonMethodNotImplementedError,
+    ResetAllError,
+)
+from . import _instrumentation
 
 
 # Since in Python everything is a class, including classes, they too can be
@@ -15,9 +23,130 @@ class SingletonMeta(ABCMeta, type):
         # This will not be overwritten, because the __init__ is for a class,
         # thus called at the moment of class definition.
         cls._instance = None
+        # Guard only the cold path of instance creation, see `__call__`.
+        cls._instance_lock = RLock()
+        cls._instance_pending = False
+        # `asyncio.Future` shared by tasks awaiting the instance creation, see
+        # `SimpleSingleton.aget_instance`.
+        cls._instance_creation = None
+        # arguments of not yet initialized instance, see `SimpleSingleton.lazy`
+        cls._instance_lazy_args = None
+        # lease counts by instance id and discarded, but still leased instances,
+        # see `ExplicitReinitSingleton.lease`
+        cls._instance_leases = {}
+        cls._draining_instances = {}
+        # Changed whenever the instance is discarded. Field references store the
+        # generation they were created under, see `SingletonInstanceFieldRef`.
+        cls._generation = 0
+        # generations reserved for instances built aside, by their ids, see
+        # `ExplicitReinitSingleton._build_detached_instance`
+        cls._detached_generations = {}
         # Metaclass' __init__ is called for each child, not only the first that
         # specifies it as its metaclass. This makes auto-generating
-        # `_is_abstract_singleton` here impossible.
+        # `_is_abstract_singleton` here impossible. For the same reason,
+        # abstract singletons are indexed here as well and removed from the
+        # index by `abstract_singleton`.
+
+        # Shadow classes (e.g. tombstones) are not singletons on their own, they
+        # point at the class they shadow. Others point at themselves, so
+        # unshadowing is a single attribute lookup.
+        if "__singleton_shadow_of__" not in cls.__dict__:
+            cls.__singleton_shadow_of__ = cls
+            _index_class(cls)
+
+    def __call__(cls, *args, **kwds) -> Any:
+        # Fast path - the instance already exists and is not being initialized,
+        # so no lock is taken and what happens next is up to the singleton's
+        # `__new__`. The order of the checks matters - the creator sets the
+        # flag before registering the instance, so once the instance is seen,
+        # the flag is up to date.
+        if cls._peek_instance() is not None and not cls._instance_pending:
+            return super().__call__(*args, **kwds)
+
+        # Cold path - single-flight creation. Threads that have lost the race
+        # get the winner's instance instead of constructing (and initializing)
+        # their own. The instance is registered in `__new__`, hence the pending
+        # flag that keeps others away from it until `__init__` finishes.
+        with cls._instance_lock:
+            if (instance := cls._peek_instance()) is not None:
+                return instance
+
+            if _instrumentation.enabled:
+                return cls._call_instrumented(args, kwds)
+
+            return cls._create_instance(args, kwds)
+
+    def _create_instance(cls, args: tuple, kwds: dict) -> Any:
+        cls._instance_pending = True
+        try:
+            return super().__call__(*args, **kwds)
+        except BaseException:
+            # The instance is registered in `__new__` - if `__init__` fails,
+            # a half-initialized one must not be left behind.
+            cls._drop_instance()
+            raise
+        finally:
+            cls._instance_pending = False
+
+    def _call_instrumented(cls, args: tuple, kwds: dict) -> Any:
+        # a dead weak reference is left behind
+        recreation = cls._instance is not None
+        start = perf_counter()
+        instance = cls._create_instance(args, kwds)
+
+        _instrumentation.record(cls, "creations")
+        _instrumentation.record(cls, "construction_time", perf_counter() - start)
+
+        if recreation:
+            _instrumentation.record(cls, "weakref_recreations")
+
+        return instance
+
+    def _peek_instance(cls) -> Any:
+        """
+        Returns the instance or `None`. Overriden by singletons that do not
+        store the instance directly.
+        """
+
+        return cls._instance
+
+    def _drop_instance(cls) -> None:
+        """
+        Forgets the instance without invalidating it. Overriden by singletons
+        that do not store the instance directly.
+        """
+
+        cls._instance = None
+        cls._instance_lazy_args = None
+        cls._bump_generation()
+
+    def _bump_generation(cls) -> None:
+        cls._generation = next(_GENERATIONS)
+
+    def _unregister_instance(cls) -> None:
+        """
+        Discards the instance. Overriden by singletons that invalidate it.
+        """
+
+        cls._drop_instance()
+
+    def _live_instances(cls) -> list[Any]:
+        if (instance := cls._peek_instance()) is None:
+            return []
+        else:
+            return [instance]
+
+    def _after_fork(cls) -> None:
+        """
+        Resets state of the parent's threads in a forked child process - they
+        do not exist there, so whatever they held or awaited is gone. Extended
+        by singletons with their own locks.
+        """
+
+        cls._instance_lock = RLock()
+        cls._instance_pending = False
+        cls._instance_creation = None
+        cls._detached_generations = {}
 
     # Unfortunately, marking this an abstractmethod does nothing ¯\_(ツ)_/¯,
     # but the intent is clearer. It is generated by a `abstract_singleton`
@@ -27,6 +156,28 @@ class SingletonMeta(ABCMeta, type):
         raise AbstractIsAbstractSingletonMethodNotImplementedError(cls)
 
 
+class LocalSingletonMeta(SingletonMeta):
+    """
+    Metaclass of singletons, whose instances are not shared between threads
+    (e.g. thread-local ones) - there is no creation race to guard against, so
+    threads do not wait for each other's construction.
+    """
+
+    def __call__(cls, *args, **kwds) -> Any:
+        if cls._peek_instance() is not None:
+            return super(SingletonMeta, cls).__call__(*args, **kwds)
+
+        if _instrumentation.enabled:
+            return cls._call_instrumented(args, kwds)
+
+        return cls._create_instance(args, kwds)
+
+
+# Generations are unique across all classes (and contexts, see
+# `ContextSingletonMeta`), so one can be reserved before it is published.
+_GENERATIONS = count(1)
+
+
 _AbstractSingletonCls = TypeVar("_AbstractSingletonCls", bound=SingletonMeta)
 
 
@@ -50,5 +201,87 @@ def abstract_singleton(
     setattr(
         __cls, original_is_abstract_singleton_method.__name__, _is_abstract_singleton
     )
+    _unindex_class(__cls)
 
     return __cls
+
+
+# ******************************************************************************
+# * Index of singleton classes
+
+# Concrete singleton classes by their tier - the nearest abstract singleton
+# base class (`None` for classes without any).
+_CLASS_INDEX: dict[type | None, WeakSet[SingletonMeta]] = {}
+_CLASS_INDEX_LOCK = Lock()
+
+
+def singleton_classes(tier: type | None = None) -> list[SingletonMeta]:
+    """
+    Returns all concrete singleton classes or only those of given `tier` - the
+    nearest abstract singleton base class (e.g. `ExplicitReinitSingleton`,
+    but not its abstract subclasses like `EnsureInitSingleton`).
+    """
+
+    with _CLASS_INDEX_LOCK:
+        if tier is not None:
+            return list(_CLASS_INDEX.get(tier, ()))
+        else:
+            return [cls for classes in _CLASS_INDEX.values() for cls in classes]
+
+
+def live_singletons(tier: type | None = None) -> list[Any]:
+    """
+    Returns instances of `singleton_classes`. Thread-local and context
+    singletons contribute only the current thread's or context's instance.
+    """
+
+    return [i for cls in singleton_classes(tier) for i in cls._live_instances()]
+
+
+def reset_all(tier: type | None = None) -> None:
+    """
+    Discards instances of all `singleton_classes` (of given `tier`) in one pass,
+    e.g. for test isolation. Instances are invalidated like by
+    `invalidate_singleton`, where the class supports it. Failures do not stop
+    the pass, they are raised at the end - more of them as `ResetAllError`.
+    """
+
+    errors = []
+
+    for cls in singleton_classes(tier):
+        try:
+            cls._unregister_instance()
+        except Exception as e:
+            errors.append(e)
+
+    if len(errors) == 1:
+        raise errors[0]
+    elif errors:
+        raise ResetAllError(tuple(errors)) from errors[0]
+
+
+def _reset_class_index_lock() -> None:
+    # vvv in a forked child - a thread of the parent might have been holding it
+    global _CLASS_INDEX_LOCK
+    _CLASS_INDEX_LOCK = Lock()
+
+
+def _index_class(cls: SingletonMeta) -> None:
+    tier = next(
+        (base for base in cls.__mro__[1:] if _is_abstract_singleton_cls(base)),
+        None,
+    )
+
+    with _CLASS_INDEX_LOCK:
+        _CLASS_INDEX.setdefault(tier, WeakSet()).add(cls)
+
+
+def _unindex_class(cls: SingletonMeta) -> None:
+    with _CLASS_INDEX_LOCK:
+        for classes in _CLASS_INDEX.values():
+            classes.discard(cls)
+
+
+def _is_abstract_singleton_cls(cls: type) -> bool:
+    # vvv injected by `abstract_singleton`
+    return "_is_abstract_singleton" in cls.__dict__ and isinstance(cls, SingletonMeta)
@@ -0,0 +1,240 @@
+"""
+Multitons - one instance per key, e.g. per tenant or per region, in a cache that
+can be bounded with LRU or LFU eviction.
+"""
+
+from abc import ABC
+from collections import OrderedDict
+from collections.abc import Hashable
+from contextlib import suppress
+from enum import Enum
+from threading import RLock
+from time import perf_counter
+from typing import Any, ClassVar
+
+from typing_extensions import Self
+
+from ..exceptions import AbstractSingletonInitError, InvalidationError, NoInstanceError
+from . import _instrumentation
+from ._base import _get_tombstone_cls
+from ._meta import SingletonMeta, abstract_singleton
+
+
+class EvictionPolicy(Enum):
+    # least recently used
+    LRU = "lru"
+    # least frequently used
+    LFU = "lfu"
+
+
+class MultitonMeta(SingletonMeta):
+    def __init__(cls, *args, **kwds) -> None:
+        super().__init__(*args, **kwds)
+        # in order of use, see `_touch`
+        cls._instances = OrderedDict()
+        cls._instance_hits = {}
+        # locks of keys, that are being created, see `__call__`
+        cls._key_locks = {}
+
+    def _after_fork(cls) -> None:
+        super()._after_fork()
+        # vvv creations of the parent's threads never finish here
+        cls._key_locks = {}
+
+    def __call__(cls, key: Hashable, *args, **kwds) -> Any:
+        # Fast path - the instance exists, it is not initialized again.
+        if (instance := cls._instances.get(key)) is not None:
+            cls._touch(key)
+            return instance
+
+        # Cold path - single-flight creation per key. Other keys are created
+        # concurrently.
+        while True:
+            with cls._instance_lock:
+                if (instance := cls._instances.get(key)) is not None:
+                    return instance
+
+                key_lock = cls._key_locks.setdefault(key, RLock())
+
+            with key_lock:
+                # vvv the creation is over - either the instance exists now or
+                # it has failed, then the next waiter tries with a new lock
+                if cls._key_locks.get(key) is not key_lock:
+                    continue
+
+                try:
+                    instance = cls._create_keyed_instance(key, args, kwds)
+                except BaseException:
+                    with cls._instance_lock:
+                        del cls._key_locks[key]
+                    raise
+
+                with cls._instance_lock:
+                    cls._instances[key] = instance
+                    cls._instance_hits[key] = 1
+                    del cls._key_locks[key]
+                    evicted = cls._pop_evicted(key)
+
+                break
+
+        for evicted_key, evicted_instance in evicted:
+            cls._on_evict(evicted_key, evicted_instance)
+
+        return instance
+
+    def _create_keyed_instance(cls, key: Hashable, args: tuple, kwds: dict) -> Any:
+        # The instance is registered only after successful initialization, so
+        # there is nothing to roll back on failure.
+        start = perf_counter()
+        instance = super().__call__(key, *args, **kwds)
+        instance.__multiton_key__ = key
+
+        if _instrumentation.enabled:
+            _instrumentation.record(cls, "creations")
+            _instrumentation.record(cls, "construction_time", perf_counter() - start)
+
+        return instance
+
+    def _live_instances(cls) -> list[Any]:
+        return list(cls._instances.values())
+
+    def _touch(cls, key: Hashable) -> None:
+        if cls.__multiton_maxsize__ is None:
+            return
+
+        # Not locked - the instance might have been evicted or invalidated in
+        # the meantime and LFU counts are approximate.
+        with suppress(KeyError):
+            if cls.__multiton_eviction__ is EvictionPolicy.LRU:
+                cls._instances.move_to_end(key)
+            else:
+                cls._instance_hits[key] += 1
+
+    def _pop_evicted(cls, new_key: Hashable) -> list[tuple[Hashable, Any]]:
+        # `_instance_lock` must be held
+        evicted = []
+
+        if (maxsize := cls.__multiton_maxsize__) is None:
+            return evicted
+
+        while len(cls._instances) > max(maxsize, 1):
+            if cls.__multiton_eviction__ is EvictionPolicy.LRU:
+                key = next(iter(cls._instances))
+            else:
+                # vvv the new instance has not had a chance to be used yet
+                hits = cls._instance_hits
+                key = min((k for k in hits if k != new_key), key=hits.__getitem__)
+
+            evicted.append((key, cls._instances.pop(key)))
+            del cls._instance_hits[key]
+
+        return evicted
+
+
+@abstract_singleton
+class Multiton(ABC, metaclass=MultitonMeta):
+    """
+    One instance per key - `Cls(key, *args, **kwds)` creates the key's instance
+    (passing the key to `__init__` as well) or returns the existing one without
+    initializing it again. Concurrent creations of one key are single-flight.
+
+    Set `__multiton_maxsize__` to bound the number of instances. Instances
+    above it are evicted according to `__multiton_eviction__` and passed to
+    `_on_evict`, e.g. to close resources. Evicted instances are not
+    invalidated, as they can still be in use, but they are not valid either.
+    `reinit` and `invalidate_singleton` work like `ExplicitReinitSingleton`'s,
+    for a single key.
+    """
+
+    __multiton_maxsize__: ClassVar[int | None] = None
+    __multiton_eviction__: ClassVar[EvictionPolicy] = EvictionPolicy.LRU
+    __singleton_no_raise_invalidation__: ClassVar[bool] = False
+
+    __multiton_key__: Hashable
+
+    @classmethod
+    def get_instance(cls, key: Hashable) -> Self:
+        if (i := cls.maybe_get_instance(key)) is None:
+            raise NoInstanceError(cls)
+        else:
+            return i
+
+    @classmethod
+    def maybe_get_instance(cls, key: Hashable) -> Self | None:
+        if (instance := cls._instances.get(key)) is not None:
+            cls._touch(key)
+
+        return instance
+
+    @classmethod
+    def instance_exists(cls, key: Hashable) -> bool:
+        return key in cls._instances
+
+    @classmethod
+    def keys(cls) -> list[Hashable]:
+        return list(cls._instances)
+
+    @classmethod
+    def reinit(cls, key: Hashable, *args, **kwds) -> Self:
+        if _instrumentation.enabled:
+            _instrumentation.record(cls, "reinits")
+
+        cls._unregister_instance(key)
+        return cls(key, *args, **kwds)
+
+    @classmethod
+    def invalidate_singleton(cls, key: Hashable, raise_invalidation=False) -> None:
+        if _instrumentation.enabled:
+            _instrumentation.record(cls, "invalidations")
+
+        cls._unregister_instance(key)
+
+        if raise_invalidation:
+            raise InvalidationError(cls)
+
+    def is_instance_valid(self) -> bool:
+        # vvv also called on tombstones
+        key = object.__getattribute__(self, "__multiton_key__")
+        return id(self) == id(type(self)._instances.get(key))
+
+    def __copy__(self) -> Self:
+        return self
+
+    def __deepcopy__(self) -> Self:
+        return self
+
+    def __new__(cls, key: Hashable, *args, **kwds) -> Self:
+        del key, args, kwds
+
+        if cls._is_abstract_singleton():
+            raise AbstractSingletonInitError(cls)
+
+        return super().__new__(cls)
+
+    @classmethod
+    def _on_evict(cls, key: Hashable, instance: Self) -> None:
+        """
+        Override to release resources of evicted instances. Called outside of
+        any lock.
+        """
+
+    @classmethod
+    def _unregister_instance(cls, *keys: Hashable) -> None:
+        """
+        Unregisters and invalidates instances of given keys, of all keys if
+        none are given.
+        """
+
+        with cls._instance_lock:
+            keys = keys or tuple(cls._instances)
+            instances = [cls._instances.pop(key, None) for key in keys]
+
+            for key in keys:
+                cls._instance_hits.pop(key, None)
+
+        if cls.__singleton_no_raise_invalidation__:
+            return
+
+        for instance in instances:
+            if instance is not None:
+                instance.__class__ = _get_tombstone_cls(type(instance))
@@ -0,0 +1,301 @@
+"""
+Singletons whose bulk state lives in `multiprocessing.shared_memory`, so that
+worker processes share one copy of it instead of building their own.
+"""
+
+import sys
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from hashlib import sha1
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from time import monotonic, sleep
+from typing import Any, ClassVar
+
+from typing_extensions import Buffer, Self
+
+from ._base import ExplicitReinitSingleton, abstract_singleton
+
+
+# Segment layout:
+# - `<name>` - header, the current generation number (0 - nothing published),
+# - `<name>.<generation>` - state's length followed by the state itself,
+# - `<name>.<generation>.claim` - exists while a process is building the state.
+_WORD = 8
+# bounds of the delay between checks, whether the state has been published
+_MIN_DELAY = 0.001
+_MAX_DELAY = 0.1
+
+
+@abstract_singleton
+class SharedStateSingleton(ExplicitReinitSingleton, ABC):
+    """
+    Its bulk state is built once, with `_build_shared_state`, by the first
+    process and published in shared memory - other processes attach to it
+    without copying. `reinit` builds and publishes a new generation of the
+    state, instances in other processes pick it up on their next
+    `shared_state` access. Processes that start together wait for the one
+    that builds the state, at most `__singleton_shared_timeout__` seconds.
+    Segments outlive the processes, remove them with `unlink_shared_state`.
+    """
+
+    # defaults to a name derived from the class' qualified name
+    __singleton_shared_name__: ClassVar[str | None] = None
+    # every instance publishes a new generation instead of attaching one
+    __singleton_shared_publish__: ClassVar[bool] = False
+    __singleton_shared_timeout__: ClassVar[float] = 30.0
+
+    # set for the next instance only, see `_publish_next`
+    _shared_publish_next: ClassVar[bool] = False
+
+    def __init__(self) -> None:
+        cls = type(self)
+        self._header = _attach_or_create_header(cls._shared_name())
+        self._state_generation = 0
+
+        with cls._instance_lock:
+            publish_next = cls._shared_publish_next
+            cls._shared_publish_next = False
+
+        if publish_next or cls.__singleton_shared_publish__:
+            self._publish(self._published_generation() + 1)
+        elif not self._published_generation():
+            self._publish(1)
+        else:
+            self._attach_published()
+
+    @property
+    def shared_state(self) -> memoryview:
+        """
+        Read-only view of the state's current generation.
+        """
+
+        if self._state_generation != self._published_generation():
+            self._attach_published()
+
+        return self._state
+
+    @property
+    def shared_state_generation(self) -> int:
+        return self._state_generation
+
+    @classmethod
+    def reinit(cls, *args, **kwds) -> Self:
+        cls._publish_next()
+        return super().reinit(*args, **kwds)
+
+    @classmethod
+    def unlink_shared_state(cls) -> None:
+        """
+        Removes the header and the current generation segments.
+        """
+
+        name = cls._shared_name()
+
+        try:
+            generation = _attach(name).cast("Q")[0]
+        except FileNotFoundError:
+            return
+
+        _unlink(f"{name}.{generation}")
+        # vvv left behind by a process that died while building
+        _unlink(f"{name}.{generation + 1}.claim")
+        _unlink(name)
+
+    @classmethod
+    @abstractmethod
+    def _build_shared_state(cls) -> Buffer:
+        """
+        Builds the state, it is called only by the publishing process.
+        """
+
+    @classmethod
+    def _new_detached_instance(cls, args: tuple, kwds: dict) -> Self:
+        instance = super()._new_detached_instance(args, kwds)
+        # vvv a rebuild, e.g. by `reinit_async`
+        cls._publish_next()
+        return instance
+
+    @classmethod
+    def _publish_next(cls) -> None:
+        """
+        Makes the next instance build and publish a new generation of the state
+        instead of attaching the published one. Rebuilds (e.g. `reinit`) call it
+        right before constructing the instance.
+        """
+
+        with cls._instance_lock:
+            cls._shared_publish_next = True
+
+    @classmethod
+    def _shared_name(cls) -> str:
+        if (name := cls.__singleton_shared_name__) is not None:
+            return name
+        else:
+            # short, because of POSIX shared memory name length limits
+            qualname = f"{cls.__module__}.{cls.__qualname__}"
+            return f"ss_{sha1(qualname.encode()).hexdigest()[:16]}"
+
+    def _published_generation(self) -> int:
+        return self._header.cast("Q")[0]
+
+    def _publish(self, generation: int) -> None:
+        """
+        Builds and publishes the state's `generation`. Only the process that
+        claims it builds the state, others attach it once it is published.
+        """
+
+        cls = type(self)
+        claim = f"{cls._shared_name()}.{generation}.claim"
+
+        for _ in _retries(cls):
+            # vvv by another process
+            if self._published_generation() >= generation:
+                break
+
+            try:
+                _create(claim, _WORD)
+            except FileExistsError:
+                # another process is building it
+                continue
+
+            try:
+                # vvv it might have been published right before the claim
+                if self._published_generation() < generation:
+                    self._publish_state(generation, cls._build_shared_state())
+                    return
+            finally:
+                _unlink(claim)
+
+        self._attach_published()
+
+    def _publish_state(self, generation: int, state: Buffer) -> None:
+        name = type(self)._shared_name()
+        state = memoryview(state).cast("B")
+        previous = self._published_generation()
+        segment_name = f"{name}.{generation}"
+
+        try:
+            segment = _create(segment_name, _WORD + len(state))
+        except FileExistsError:
+            # left behind by a process that died while publishing - the claim
+            # is held, so nobody else uses it
+            _unlink(segment_name)
+            segment = _create(segment_name, _WORD + len(state))
+
+        segment[:_WORD].cast("Q")[0] = len(state)
+        segment[_WORD : _WORD + len(state)] = state
+        # One aligned word store - readers see either the old generation or
+        # the new one, which is already complete.
+        self._header.cast("Q")[0] = generation
+        self._bind(segment, generation)
+
+        if previous:
+            # already attached readers keep their mappings
+            _unlink(f"{name}.{previous}")
+
+    def _attach_published(self) -> None:
+        cls = type(self)
+        name = cls._shared_name()
+
+        for _ in _retries(cls):
+            # vvv nothing published yet, the state is still being built
+            if not (generation := self._published_generation()):
+                continue
+
+            try:
+                segment = _attach(f"{name}.{generation}")
+            except FileNotFoundError:
+                # superseded and unlinked in the meantime
+                continue
+
+            self._bind(segment, generation)
+            return
+
+    def _bind(self, segment: memoryview, generation: int) -> None:
+        length = segment[:_WORD].cast("Q")[0]
+        self._state = segment[_WORD : _WORD + length].toreadonly()
+        self._state_generation = generation
+
+
+def _retries(cls: type[SharedStateSingleton]) -> Iterator[None]:
+    """
+    Yields right away and then after exponentially growing delays, until
+    the class' `__singleton_shared_timeout__` runs out.
+    """
+
+    deadline = monotonic() + cls.__singleton_shared_timeout__
+    delay = _MIN_DELAY
+
+    while True:
+        yield
+
+        if monotonic() >= deadline:
+            raise TimeoutError(
+                f"shared state {cls._shared_name()!r} of {cls.__qualname__} has not"
+                " been published in time - if its publisher has died, remove it"
+                " with `unlink_shared_state`"
+            )
+
+        sleep(delay)
+        delay = min(delay * 2, _MAX_DELAY)
+
+
+def _attach_or_create_header(name: str) -> memoryview:
+    try:
+        return _create(name, _WORD)
+    except FileExistsError:
+        return _attach(name)
+
+
+# Segments are managed explicitly - the resource tracker would otherwise unlink
+# them when the creating (or, before Python 3.13, any attached) process exits.
+_UNTRACKED: dict[str, Any] = {"track": False} if sys.version_info >= (3, 13) else {}
+
+
+def _create(name: str, size: int) -> memoryview:
+    return _map(_open(name, create=True, size=size))
+
+
+def _attach(name: str) -> memoryview:
+    return _map(_open(name))
+
+
+def _open(name: str, create: bool = False, size: int = 0) -> SharedMemory:
+    segment = SharedMemory(name, create=create, size=size, **_UNTRACKED)
+
+    if not _UNTRACKED:
+        resource_tracker.unregister(segment._name, "shared_memory")  # type: ignore
+
+    return segment
+
+
+def _map(segment: SharedMemory) -> memoryview:
+    """
+    Takes the mapping over from the `SharedMemory` object. It gets unmapped
+    together with its last view, so closing it can never fail because of views
+    that are still in use (e.g. when the garbage collector finalizes
+    the `SharedMemory` first).
+    """
+
+    # Relies on private attributes of `SharedMemory` (`_mmap`, `_buf` and, in
+    # `_open` and `_unlink`, `_name`) - there is no public way to do this.
+    mapping = memoryview(segment._mmap)  # type: ignore
+    segment._buf.release()  # type: ignore
+    segment._buf = segment._mmap = None  # type: ignore
+    segment.close()
+    return mapping
+
+
+def _unlink(name: str) -> None:
+    try:
+        segment = _open(name)
+    except FileNotFoundError:
+        return
+
+    if not _UNTRACKED:
+        # vvv `unlink` unregisters the segment from the tracker again
+        resource_tracker.register(segment._name, "shared_memory")  # type: ignore
+
+    segment.close()
+    segment.unlink()
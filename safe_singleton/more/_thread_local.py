@@ -0,0 +1,100 @@
+"""
+Singletons with one instance per thread, e.g. for wrapping clients that are not
+thread-safe without serializing all threads on a lock.
+"""
+
+from abc import ABC
+from contextlib import suppress
+from threading import Lock, local
+from weakref import WeakSet
+
+from typing_extensions import Self
+
+from ._base import ExplicitReinitSingleton, SimpleSingleton
+from ._meta import LocalSingletonMeta, abstract_singleton
+
+
+class ThreadLocalSingletonMeta(LocalSingletonMeta):
+    def __init__(cls, *args, **kwds) -> None:
+        super().__init__(*args, **kwds)
+        # Each thread sees its own `instance` attribute. When a thread ends, its
+        # attributes are released by the interpreter.
+        cls._instance_local = local()
+        # instances of all threads, so that they can be invalidated at once
+        cls._thread_instances = WeakSet()
+        cls._thread_instances_lock = Lock()
+
+    def _after_fork(cls) -> None:
+        super()._after_fork()
+        cls._thread_instances_lock = Lock()
+
+
+@abstract_singleton
+class ThreadLocalSingleton(SimpleSingleton, ABC, metaclass=ThreadLocalSingletonMeta):
+    """
+    See `SimpleSingleton`. Each thread has its own instance, that is released
+    when the thread ends.
+    """
+
+    @classmethod
+    def maybe_get_instance(cls) -> Self | None:
+        return getattr(cls._instance_local, "instance", None)
+
+    @classmethod
+    def _register_new_instance(cls, new_instance: Self) -> Self:
+        # vvv both at once, so that `_drop_thread_instances` can not swap in
+        # a new `local` in between and miss the instance
+        with cls._thread_instances_lock:
+            cls._thread_instances.add(new_instance)
+            cls._instance_local.instance = new_instance
+
+        return new_instance
+
+    @classmethod
+    def _drop_instance(cls) -> None:
+        # Only the current thread's one. The generation is shared by all
+        # threads, so it is not bumped here.
+        with suppress(AttributeError):
+            instance = cls._instance_local.instance
+            del cls._instance_local.instance
+
+            with cls._thread_instances_lock:
+                cls._thread_instances.discard(instance)
+
+        cls._instance_lazy_args = None
+
+    @classmethod
+    def _unregister_instance(cls) -> None:
+        cls._drop_thread_instances()
+
+    @classmethod
+    def _drop_thread_instances(cls) -> list[Self]:
+        """
+        Forgets instances of all threads, returns them.
+        """
+
+        with cls._thread_instances_lock:
+            instances = list(cls._thread_instances)
+            cls._thread_instances.clear()
+            # vvv drops the instance of every thread at once
+            cls._instance_local = local()
+            cls._bump_generation()
+
+        cls._instance_lazy_args = None
+        return instances
+
+
+@abstract_singleton
+class ThreadLocalExplicitReinitSingleton(
+    ThreadLocalSingleton, ExplicitReinitSingleton, ABC
+):
+    """
+    See `ExplicitReinitSingleton`. `reinit` and `invalidate_singleton`
+    invalidate instances of all threads, the new instance is created only for
+    the calling thread - others create theirs on the next call.
+    """
+
+    @classmethod
+    def _unregister_instance(cls) -> None:
+        for instance in cls._drop_thread_instances():
+            cls._retire_instance(instance)
@@ -0,0 +1,187 @@
+"""
+Singletons, that are rebuilt in the background when their time to live expires.
+Readers keep getting the current (stale) instance until the new one is swapped
+in, so they never wait for the construction.
+"""
+
+from abc import ABC
+from enum import Enum
+from threading import Event, Thread, current_thread
+from time import monotonic
+from typing import ClassVar
+
+from typing_extensions import Self
+
+from ._base import ExplicitReinitSingleton
+from ._meta import SingletonMeta, abstract_singleton
+
+
+class RefreshPolicy(Enum):
+    # the stale instance is kept until the next refresh, a TTL later
+    KEEP_STALE = "keep_stale"
+    # the stale instance is kept and the refresh is retried with exponential
+    # backoff, see `TTLSingleton.__singleton_refresh_backoff__`
+    RETRY = "retry"
+    # the stale instance is invalidated, the next one is created on demand
+    INVALIDATE = "invalidate"
+
+
+class TTLSingletonMeta(SingletonMeta):
+    def _after_fork(cls) -> None:
+        super()._after_fork()
+        # vvv the parent's refresher does not exist in the child
+        cls._ttl_refresher = None
+        cls._ttl_stop = None
+
+        if cls._peek_instance() is not None:
+            cls._ensure_refresher()
+
+
+@abstract_singleton
+class TTLSingleton(ExplicitReinitSingleton, ABC, metaclass=TTLSingletonMeta):
+    """
+    See `ExplicitReinitSingleton`. The instance is rebuilt by a background
+    thread every `__singleton_ttl__` seconds with the arguments of the last
+    (re)initialization and then swapped in - the old one gets invalidated.
+    `__singleton_refresh_policy__` decides what happens when rebuilding fails.
+    """
+
+    __singleton_ttl__: ClassVar[float]
+    __singleton_refresh_policy__: ClassVar[RefreshPolicy] = RefreshPolicy.KEEP_STALE
+    # the first retry delay in seconds, it doubles up to the TTL
+    __singleton_refresh_backoff__: ClassVar[float] = 1.0
+
+    _ttl_args: ClassVar[tuple[tuple, dict]] = ((), {})
+    _ttl_expires_at: ClassVar[float] = 0.0
+    _ttl_refresher: ClassVar[Thread | None] = None
+    _ttl_stop: ClassVar[Event | None] = None
+
+    @classmethod
+    def expires_in(cls) -> float:
+        """
+        Seconds left until the next refresh, negative while it is late.
+        """
+
+        return cls._ttl_expires_at - monotonic()
+
+    @classmethod
+    def stop_refreshing(cls, timeout: float | None = None) -> None:
+        """
+        Stops the background refresher, the instance stays as it is. It is
+        started again with the next instance creation.
+        """
+
+        with cls._instance_lock:
+            stop, refresher = cls._ttl_stop, cls._ttl_refresher
+            # vvv so that the next creation does not wait for it to exit
+            cls._ttl_refresher = None
+
+        if stop is not None:
+            stop.set()
+
+        if refresher is not None:
+            refresher.join(timeout)
+
+    def __new__(cls, *args, **kwds) -> Self:
+        instance = super().__new__(cls, *args, **kwds)
+
+        with cls._instance_lock:
+            cls._ttl_args = (args, kwds)
+            cls._ttl_expires_at = monotonic() + cls.__singleton_ttl__
+            cls._ensure_refresher()
+
+        return instance
+
+    @classmethod
+    def _new_detached_instance(cls, args: tuple, kwds: dict) -> Self:
+        instance = super()._new_detached_instance(args, kwds)
+
+        with cls._instance_lock:
+            cls._ttl_args = (args, kwds)
+
+        return instance
+
+    @classmethod
+    def _swap_instance(cls, new_instance: Self) -> Self:
+        with cls._instance_lock:
+            cls._ttl_expires_at = monotonic() + cls.__singleton_ttl__
+            # vvv the first instance might have been swapped in, see `reinit_async`
+            cls._ensure_refresher()
+            return super()._swap_instance(new_instance)
+
+    @classmethod
+    def _ensure_refresher(cls) -> None:
+        # `_instance_lock` must be held - a refresher that is about to exit
+        # forgets itself under it, see `_forget_refresher`
+        if (refresher := cls._ttl_refresher) is not None and refresher.is_alive():
+            return
+
+        cls._ttl_stop = stop = Event()
+        cls._ttl_refresher = refresher = Thread(
+            target=cls._refresh_loop,
+            args=(stop,),
+            name=f"{cls.__qualname__} refresher",
+            daemon=True,
+        )
+        refresher.start()
+
+    @classmethod
+    def _refresh_loop(cls, stop: Event) -> None:
+        backoff = cls.__singleton_refresh_backoff__
+        delay = cls.expires_in()
+
+        while not stop.wait(max(delay, 0.0)):
+            with cls._instance_lock:
+                if (stale := cls.maybe_get_instance()) is None:
+                    # vvv invalidated, the next creation starts a new refresher
+                    cls._forget_refresher()
+                    return
+
+            if (delay := cls.expires_in()) > 0:
+                # vvv reinitialized in the meantime
+                continue
+
+            args, kwds = cls._ttl_args
+
+            try:
+                fresh = cls._build_detached_instance(*args, **kwds)
+            except Exception:
+                policy = cls.__singleton_refresh_policy__
+
+                if policy is RefreshPolicy.INVALIDATE:
+                    # vvv the next iteration exits, unless a new instance has
+                    # been created in the meantime
+                    cls._unregister_if_current(stale)
+                    delay = 0.0
+                elif policy is RefreshPolicy.RETRY:
+                    delay = min(backoff, cls.__singleton_ttl__)
+                    backoff *= 2
+                else:
+                    delay = cls.__singleton_ttl__
+
+                continue
+
+            backoff = cls.__singleton_refresh_backoff__
+            delay = cls.__singleton_ttl__
+
+            with cls._instance_lock:
+                # vvv otherwise reinitialized or invalidated while building
+                if cls.maybe_get_instance() is stale:
+                    cls._swap_instance(fresh)
+                else:
+                    cls._discard_detached_instance(fresh)
+
+        with cls._instance_lock:
+            cls._forget_refresher()
+
+    @classmethod
+    def _forget_refresher(cls) -> None:
+        # `_instance_lock` must be held
+        if cls._ttl_refresher is current_thread():
+            cls._ttl_refresher = None
+
+    @classmethod
+    def _unregister_if_current(cls, instance: Self) -> None:
+        with cls._instance_lock:
+            if cls.maybe_get_instance() is instance:
+                cls._unregister_instance()
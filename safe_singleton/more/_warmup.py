@@ -0,0 +1,240 @@
+"""
+Eager, concurrent construction of singletons at startup. Independent singletons
+are built in parallel, the ones depending on others only after their
+dependencies are ready.
+"""
+
+import asyncio
+from collections.abc import Callable, Collection, Iterable, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from graphlib import TopologicalSorter
+from time import perf_counter
+from typing import Any, TypeVar
+
+from ._base import SimpleSingleton, _materialize_lazy_instance
+
+
+_ClsT = TypeVar("_ClsT", bound=type)
+Dependencies = Mapping[type, Iterable[type]]
+
+
+@dataclass
+class WarmUpReport:
+    # in order of completion
+    built: list[type] = field(default_factory=list)
+    failed: dict[type, BaseException] = field(default_factory=dict)
+    # not built, because one of their dependencies has failed
+    skipped: list[type] = field(default_factory=list)
+    # construction time of each built class in seconds
+    timings: dict[type, float] = field(default_factory=dict)
+    # the longest chain of dependent constructions, it bounds the warm-up time
+    # no matter how many workers there are
+    critical_path: list[type] = field(default_factory=list)
+    critical_path_time: float = 0.0
+    wall_time: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed and not self.skipped
+
+
+def depends_on(*dependencies: type) -> Callable[[_ClsT], _ClsT]:
+    """
+    Declares classes, that have to be built by `warm_up` before the decorated
+    one. Dependencies are inherited by subclasses.
+    """
+
+    def depends_on_decorator(cls: _ClsT) -> _ClsT:
+        cls.__singleton_dependencies__ = dependencies
+        return cls
+
+    return depends_on_decorator
+
+
+def warm_up(
+    classes: Iterable[type],
+    *,
+    dependencies: Dependencies | None = None,
+    max_workers: int | None = None,
+    build: Callable[[type], Any] | None = None,
+) -> WarmUpReport:
+    """
+    Builds instances of `classes` (and their dependencies) on a thread pool in
+    topological order. Dependencies are declared with `depends_on` and/or
+    given as a mapping from a class to the classes it depends on.
+
+    Already existing instances are kept, lazy ones (see `SimpleSingleton.lazy`)
+    are initialized. Failures do not stop the warm-up - the failed class is
+    left without an instance, the classes depending on it are skipped and the
+    independent ones are still built. Raises `graphlib.CycleError` on
+    a dependency cycle.
+
+    `build` can be used to warm up classes that are not singletons themselves,
+    e.g. `SingletonRegistry.get_instance`.
+    """
+
+    build = build or _build_singleton
+    graph = _collect_dependencies(classes, dependencies)
+    report = WarmUpReport()
+    start = perf_counter()
+
+    sorter = TopologicalSorter(graph)
+    sorter.prepare()
+
+    with ThreadPoolExecutor(max_workers, thread_name_prefix="warm_up") as executor:
+        pending: dict[Future[float], type] = {}
+
+        while sorter.is_active():
+            for cls in sorter.get_ready():
+                if _should_skip(cls, graph, report):
+                    sorter.done(cls)
+                else:
+                    pending[executor.submit(_timed, build, cls)] = cls
+
+            if not pending:
+                # vvv only skipped classes were ready, they unlocked others
+                continue
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                cls = pending.pop(future)
+                _report_build(cls, future, report)
+                sorter.done(cls)
+
+    _finish_report(report, graph, start)
+    return report
+
+
+async def awarm_up(
+    classes: Iterable[type[SimpleSingleton]],
+    *,
+    dependencies: Dependencies | None = None,
+) -> WarmUpReport:
+    """
+    Async counterpart of `warm_up` - instances are created concurrently with
+    `aget_instance` (see `SimpleSingleton._acreate_instance`).
+    """
+
+    graph = _collect_dependencies(classes, dependencies)
+    report = WarmUpReport()
+    start = perf_counter()
+
+    sorter = TopologicalSorter(graph)
+    sorter.prepare()
+    pending: dict[asyncio.Task[float], type] = {}
+
+    while sorter.is_active():
+        for cls in sorter.get_ready():
+            if _should_skip(cls, graph, report):
+                sorter.done(cls)
+            else:
+                pending[asyncio.ensure_future(_atimed(cls))] = cls
+
+        if not pending:
+            continue
+
+        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+        for task in done:
+            cls = pending.pop(task)
+            _report_build(cls, task, report)
+            sorter.done(cls)
+
+    _finish_report(report, graph, start)
+    return report
+
+
+def _collect_dependencies(
+    classes: Iterable[type], dependencies: Dependencies | None
+) -> dict[type, set[type]]:
+    """
+    Returns the dependency graph of `classes` and, transitively, of their
+    dependencies.
+    """
+
+    dependencies = dependencies or {}
+    graph: dict[type, set[type]] = {}
+    to_visit = list(classes)
+
+    while to_visit:
+        if (cls := to_visit.pop()) in graph:
+            continue
+
+        deps = {
+            *getattr(cls, "__singleton_dependencies__", ()),
+            *dependencies.get(cls, ()),
+        }
+        # vvv inherited from a base class, that depends on its subclass
+        deps.discard(cls)
+        graph[cls] = deps
+        to_visit.extend(deps)
+
+    return graph
+
+
+def _build_singleton(cls: type[SimpleSingleton]) -> None:
+    if (instance := cls.maybe_get_instance()) is None:
+        cls()
+    else:
+        _materialize_lazy_instance(instance)
+
+
+def _timed(build: Callable[[type], Any], cls: type) -> float:
+    start = perf_counter()
+    build(cls)
+    return perf_counter() - start
+
+
+async def _atimed(cls: type[SimpleSingleton]) -> float:
+    start = perf_counter()
+    instance = await cls.aget_instance()
+    _materialize_lazy_instance(instance)
+    return perf_counter() - start
+
+
+def _should_skip(
+    cls: type, graph: Mapping[type, Collection[type]], report: WarmUpReport
+) -> bool:
+    if skip := any(
+        dep in report.failed or dep in report.skipped for dep in graph[cls]
+    ):
+        report.skipped.append(cls)
+
+    return skip
+
+
+def _report_build(
+    cls: type, future: "Future[float] | asyncio.Future[float]", report: WarmUpReport
+) -> None:
+    if (e := future.exception()) is None:
+        report.built.append(cls)
+        report.timings[cls] = future.result()
+    else:
+        report.failed[cls] = e
+
+
+def _finish_report(
+    report: WarmUpReport, graph: Mapping[type, Collection[type]], start: float
+) -> None:
+    report.wall_time = perf_counter() - start
+
+    # (time, path) of the longest chain ending with the class
+    chains: dict[type, tuple[float, list[type]]] = {}
+
+    for cls in TopologicalSorter(graph).static_order():
+        if cls not in report.timings:
+            continue
+
+        time, path = max(
+            (chains[dep] for dep in graph[cls] if dep in chains),
+            key=lambda chain: chain[0],
+            default=(0.0, []),
+        )
+        chains[cls] = (time + report.timings[cls], [*path, cls])
+
+    if chains:
+        report.critical_path_time, report.critical_path = max(
+            chains.values(), key=lambda chain: chain[0]
+        )
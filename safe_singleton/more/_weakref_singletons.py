@@ -25,13 +25,26 @@ class SimpleWeakRefSingleton(SimpleSingleton, ABC):
     def get_instance_as_ref(cls) -> ReferenceType[Self]:
         return super().get_instance().as_ref()
 
+    @classmethod
+    def maybe_get_instance(cls) -> Self | None:
+        if (instance_ref := cls._instance) is None:
+            return None
+        else:
+            return instance_ref()
+
     @classmethod
     def _register_new_instance(cls, i: Self) -> Self:
-        cls._instance = ref(i)
+        cls._instance = ref(i, cls._forget_collected_instance)
         # Instance must be returned, because otherwise `cls` will lose the only
         # one hard reference to the instance during it very initialization
         return i
 
+    @classmethod
+    def _forget_collected_instance(cls, instance_ref: ReferenceType[Self]) -> None:
+        # vvv otherwise a newer instance has been registered in the meantime
+        if cls._instance is instance_ref:
+            cls._bump_generation()
+
 
 @abstract_singleton
 class NoImplicitReinitWeakRefSingleton(
@@ -41,13 +54,6 @@ class NoImplicitReinitWeakRefSingleton(
     See `NoImplicitReinitSingleton`.
     """
 
-    @classmethod
-    def maybe_get_instance(cls) -> Self | None:
-        if (instance_ref := cls._instance) is None:
-            return None
-        else:
-            return instance_ref()
-
 
 @abstract_singleton
 class ExplicitReinitWeakRefSingleton(
@@ -59,7 +65,9 @@ class ExplicitReinitWeakRefSingleton(
 
 
 @abstract_singleton
-class EnsureInitWeakRefSingleton(EnsureInitSingleton):
+class EnsureInitWeakRefSingleton(
+    ExplicitReinitWeakRefSingleton, EnsureInitSingleton, ABC
+):
     """
     See `EnsureInitWeakRefSingleton`.
     """
@@ -0,0 +1,30 @@
+from collections.abc import Callable
+from concurrent.futures import Future
+from threading import Thread
+from typing import TypeVar
+
+
+_T = TypeVar("_T")
+
+
+def run_in_thread(f: Callable[..., _T], *args, **kwds) -> Future[_T]:
+    """
+    Calls `f` in a new daemon thread. The returned future gets its result or
+    exception - use `asyncio.wrap_future` to await it.
+    """
+
+    future: Future[_T] = Future()
+
+    def run() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+
+        try:
+            result = f(*args, **kwds)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    Thread(target=run, daemon=True).start()
+    return future
@@ -1 +1 @@
-from ._base import Registry
+from ._base import ConcurrentRegistry, Registry, RegistrySnapshot
@@ -7,8 +7,8 @@ from collections.abc import (
     Mapping,
     ValuesView,
 )
-from contextlib import suppress
-from operator import setitem
+from itertools import repeat
+from threading import Lock
 from typing import Generic, KeysView, Literal, TypeVar, overload
 
 from typing_extensions import Self
@@ -22,42 +22,138 @@ _T = TypeVar("_T")
 _K_other = TypeVar("_K_other", bound=Hashable)
 _V_other = TypeVar("_V_other")
 
+_MISSING = object()
+
+
+class RegistrySnapshot(Mapping, Generic[_K, _V]):
+    """
+    Immutable view of a `Registry` at given `version`. It is safe to iterate it
+    while the registry is being modified.
+    """
+
+    __slots__ = ("_memory", "version")
+
+    def __init__(self, memory: dict[_K, _V], version: int) -> None:
+        # vvv never modified - the registry copies it before the next write
+        self._memory = memory
+        self.version = version
+
+    def keys(self) -> KeysView[_K]:
+        return self._memory.keys()
+
+    def values(self) -> ValuesView[_V]:
+        return self._memory.values()
+
+    def items(self) -> ItemsView[_K, _V]:
+        return self._memory.items()
+
+    def __iter__(self) -> Iterator[_K]:
+        return iter(self._memory)
+
+    def __getitem__(self, __k: _K) -> _V:
+        return self._memory[__k]
+
+    def __contains__(self, __k: object) -> bool:
+        return __k in self._memory
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._memory!r}, version={self.version})"
+
 
 class Registry(Mapping, Generic[_K, _V]):
     def __init__(
         self, source: Mapping[_K, _V] | Iterable[tuple[_K, _V]] | None = None
     ) -> None:
         self._memory: dict[_K, _V] = dict(source or {})
+        # Copy-on-write - `_memory` is shared with a snapshot and has to be
+        # copied before it is modified.
+        self._shared = False
+        self._version = 0
 
-    def register(self, key: _K, val: _V, force=False) -> Self:
-        remember = lambda: setitem(self._memory, key, val)
+    @property
+    def version(self) -> int:
+        """
+        Incremented on each modification.
+        """
 
-        if force:
-            remember()
-        elif key not in self:
-            remember()
-        else:
-            raise AlreadyRegisteredError(key)
+        return self._version
+
+    def snapshot(self) -> RegistrySnapshot[_K, _V]:
+        """
+        Returns an immutable view of the current state in O(1). The next
+        modification copies the underlying dict once, instead.
+        """
+
+        self._shared = True
+        return RegistrySnapshot(self._memory, self._version)
 
+    def register(self, key: _K, val: _V, force=False) -> Self:
+        self._register(key, val, force)
         return self
 
     def unregister(self, key: _K) -> _V:
-        try:
-            return self._memory[key]
-        except KeyError as e:
-            raise NotRegisteredError(key) from e
+        if key not in self._memory:
+            raise NotRegisteredError(key)
+
+        return self._writable_memory().pop(key)
 
     def try_register(self, key: _K, val: _V) -> Self:
-        with suppress(AlreadyRegisteredError):
-            self.register(key, val, force=False)
+        if key not in self._memory:
+            self._writable_memory()[key] = val
         return self
 
     def try_unregister(self, key: _K) -> _V | None:
-        try:
-            return self.unregister(key)
-        except AlreadyRegisteredError:
+        if key not in self._memory:
             return None
 
+        return self._writable_memory().pop(key)
+
+    def try_unregister_value(self, key: _K, val: _V) -> bool:
+        """
+        Unregisters `key` only if it is registered with `val` (compared by
+        identity), returns whether it was.
+        """
+
+        if self._memory.get(key, _MISSING) is not val:
+            return False
+
+        del self._writable_memory()[key]
+        return True
+
+    def register_many(
+        self, items: Mapping[_K, _V] | Iterable[tuple[_K, _V]], force=False
+    ) -> Self:
+        """
+        Registers all items or, if any of them is already registered (or
+        repeated), none of them.
+        """
+
+        self._register_many(items, force)
+        return self
+
+    def unregister_many(self, keys: Iterable[_K]) -> list[_V]:
+        """
+        Unregisters all keys or, if any of them is not registered (or repeated),
+        none of them.
+        """
+
+        keys = list(keys)
+        unique_keys = dict.fromkeys(keys)
+
+        if len(unique_keys) != len(keys):
+            raise NotRegisteredError(_first_repeated(keys))
+        elif not self._memory.keys() >= unique_keys.keys():
+            raise NotRegisteredError(next(k for k in keys if k not in self._memory))
+
+        memory = self._writable_memory()
+        return [memory.pop(k) for k in keys]
+
+    def get_many(self, keys: Iterable[_K], default: _T | None = None) -> list[_V | _T]:
+        return list(map(self._memory.get, keys, repeat(default)))
+
     @classmethod
     def from_dict(cls, d: dict[_K, _V]) -> Self:
         return cls._from(d)
@@ -72,7 +168,7 @@ class Registry(Mapping, Generic[_K, _V]):
 
     @classmethod
     def from_iterable(cls, i: Iterable) -> Self:
-        return cls._from(i)
+        return cls().register_many(i)
 
     @classmethod
     def _from(cls, src) -> Self:
@@ -105,18 +201,52 @@ class Registry(Mapping, Generic[_K, _V]):
         return self._memory.get(k, default)
 
     def update(self, other: Mapping[_K, _V] | Iterable[tuple[_K, _V]]) -> Self:
-        source: Iterable[tuple[_K, _V]]
-        source = other.items() if isinstance(other, Mapping) else other  # type: ignore
-
-        for k, v in source:
-            self.register(k, v)
-
+        self._register_many(other, force=False)
         return self
 
     def clear(self) -> Self:
-        self._memory.clear()
+        self._memory = {}
+        self._shared = False
+        self._version += 1
         return self
 
+    def _register(self, key: _K, val: _V, force: bool) -> None:
+        if not force and key in self._memory:
+            raise AlreadyRegisteredError(key)
+
+        self._writable_memory()[key] = val
+
+    def _register_many(
+        self, items: Mapping[_K, _V] | Iterable[tuple[_K, _V]], force: bool
+    ) -> None:
+        # the whole batch is validated before anything is registered
+        if isinstance(items, Mapping):
+            batch = dict(items)
+        else:
+            items = list(items)
+            batch = dict(items)
+
+            if not force and len(batch) != len(items):
+                raise AlreadyRegisteredError(_first_repeated(k for k, _ in items))
+
+        if not force and not self._memory.keys().isdisjoint(batch):
+            raise AlreadyRegisteredError(next(k for k in batch if k in self._memory))
+
+        self._writable_memory().update(batch)
+
+    def _writable_memory(self) -> dict[_K, _V]:
+        """
+        Returns `_memory` that is safe to modify and bumps the version - call
+        it right before the modification.
+        """
+
+        if self._shared:
+            self._memory = dict(self._memory)
+            self._shared = False
+
+        self._version += 1
+        return self._memory
+
     def __iter__(self) -> Iterator[_K]:
         return iter(self._memory)
 
@@ -128,8 +258,78 @@ class Registry(Mapping, Generic[_K, _V]):
     ) -> dict[_K | _K_other, _V | _V_other]:
         return self._memory | other
 
-    def __ior__(self, other: Mapping[_K, _V]) -> None:
-        self.update(other)
+    def __ior__(self, other: Mapping[_K, _V]) -> Self:
+        return self.update(other)
 
     def __len__(self) -> int:
         return len(self._memory)
+
+
+class ConcurrentRegistry(Registry, Generic[_K, _V]):
+    """
+    Thread-safe `Registry` - modifications are atomic, reads (`__getitem__`,
+    `get`, `in`) do not take the lock. Iterate over its `snapshot`, when other
+    threads may modify it in the meantime.
+    """
+
+    def __init__(
+        self, source: Mapping[_K, _V] | Iterable[tuple[_K, _V]] | None = None
+    ) -> None:
+        super().__init__(source)
+        self._lock = Lock()
+
+    def register(self, key: _K, val: _V, force=False) -> Self:
+        with self._lock:
+            self._register(key, val, force)
+        return self
+
+    def unregister(self, key: _K) -> _V:
+        with self._lock:
+            return super().unregister(key)
+
+    def try_register(self, key: _K, val: _V) -> Self:
+        with self._lock:
+            return super().try_register(key, val)
+
+    def try_unregister(self, key: _K) -> _V | None:
+        with self._lock:
+            return super().try_unregister(key)
+
+    def try_unregister_value(self, key: _K, val: _V) -> bool:
+        with self._lock:
+            return super().try_unregister_value(key, val)
+
+    def register_many(
+        self, items: Mapping[_K, _V] | Iterable[tuple[_K, _V]], force=False
+    ) -> Self:
+        with self._lock:
+            self._register_many(items, force)
+        return self
+
+    def unregister_many(self, keys: Iterable[_K]) -> list[_V]:
+        with self._lock:
+            return super().unregister_many(keys)
+
+    def update(self, other: Mapping[_K, _V] | Iterable[tuple[_K, _V]]) -> Self:
+        with self._lock:
+            return super().update(other)
+
+    def clear(self) -> Self:
+        with self._lock:
+            return super().clear()
+
+    def snapshot(self) -> RegistrySnapshot[_K, _V]:
+        # vvv a modification in progress could end up in the snapshot
+        with self._lock:
+            return super().snapshot()
+
+
+def _first_repeated(keys: Iterable[_K]) -> _K:
+    seen = set()
+
+    for k in keys:
+        if k in seen:
+            return k
+        seen.add(k)
+
+    raise ValueError("no repeated keys")
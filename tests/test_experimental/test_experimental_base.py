@@ -0,0 +1,166 @@
+import gc
+from threading import Barrier, Thread
+from time import sleep
+
+import pytest
+
+from safe_singleton.exceptions import ImplicitReinitError
+from safe_singleton.experimental._base import (
+    SingletonRegistry,
+    SingletonWeakRegistry,
+    register,
+)
+from safe_singleton.experimental.exceptions import GetInstanceError
+from safe_singleton.utils.registry.exceptions import NotRegisteredError
+
+
+def test_registry_remembers_instance():
+    registry = SingletonRegistry()
+
+    @register(registry)
+    class Foo:
+        ...
+
+    instance = Foo()
+    assert registry.get_instance(Foo) is instance
+
+    with pytest.raises(ImplicitReinitError):
+        Foo()
+
+
+def test_weak_registry_drops_dead_instances_eagerly():
+    registry = SingletonWeakRegistry()
+    classes = []
+
+    for _ in range(10):
+
+        @register(registry)
+        class Foo:
+            ...
+
+        classes.append(Foo)
+        Foo()
+
+    gc.collect()
+    assert registry.size == 0
+    assert registry.purge_count == 10
+
+
+def test_weak_registry_gc_during_locked_write():
+    registry = SingletonWeakRegistry()
+
+    class CollectingMeta(type):
+        def __hash__(cls) -> int:
+            # vvv runs under the registry's lock
+            gc.collect()
+            return id(cls)
+
+    @register(registry)
+    class Foo:
+        ...
+
+    class Bar(metaclass=CollectingMeta):
+        ...
+
+    # vvv freed only by the garbage collector
+    foo = Foo()
+    foo.cycle = foo
+    del foo
+
+    bar = Bar()
+    registration = Thread(target=registry._memorize, args=(Bar, bar), daemon=True)
+    registration.start()
+    registration.join(5)
+
+    assert not registration.is_alive()
+    assert registry.size == 1
+    assert registry.purge_count == 1
+
+
+def test_weak_registry_allows_new_instance_after_death():
+    registry = SingletonWeakRegistry()
+
+    @register(registry)
+    class Foo:
+        ...
+
+    Foo()
+    instance = Foo()
+    assert registry.get_instance(Foo) is instance
+    assert registry.size == 1
+
+
+def test_factory_is_called_on_first_get_instance():
+    registry = SingletonRegistry()
+    built = []
+
+    class Plugin:
+        def __init__(self) -> None:
+            built.append(self)
+
+    registry.register_factory(Plugin, name="plugin")
+    assert not built
+
+    instance = registry.get_instance("plugin")
+    assert built == [instance]
+    assert registry.get_instance(Plugin) is instance
+    assert Plugin in registry.factory_timings
+
+
+def test_factory_creation_is_single_flight():
+    registry = SingletonRegistry()
+    calls = []
+    n_threads = 8
+    barrier = Barrier(n_threads)
+
+    def factory() -> object:
+        calls.append(None)
+        sleep(0.01)
+        return object()
+
+    registry.register_factory(object, factory)
+    results = []
+
+    def run() -> None:
+        barrier.wait()
+        results.append(registry.get_instance(object))
+
+    threads = [Thread(target=run) for _ in range(n_threads)]
+
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_weak_registry_factory_rebuilds_dead_instance():
+    registry = SingletonWeakRegistry()
+    built = []
+
+    class Plugin:
+        def __init__(self) -> None:
+            built.append(None)
+
+    registry.register_factory(Plugin)
+    instance = registry.get_instance(Plugin)
+    assert registry.get_instance(Plugin) is instance
+    assert len(built) == 1
+
+    del instance
+    gc.collect()
+
+    assert isinstance(registry.get_instance(Plugin), Plugin)
+    assert len(built) == 2
+
+
+def test_unknown_name():
+    with pytest.raises(GetInstanceError) as e:
+        SingletonRegistry().get_instance("unknown")
+
+    assert isinstance(e.value.__cause__, NotRegisteredError)
+
+    with pytest.raises(GetInstanceError):
+        SingletonRegistry().get_instance(object)
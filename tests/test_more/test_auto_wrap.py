@@ -0,0 +1,114 @@
+import pytest
+
+from safe_singleton.exceptions import InvalidationError, NotSubclsError
+from safe_singleton.more import (
+    ExplicitReinitSingleton,
+    SimpleSingleton,
+    SingletonFieldProxy,
+    auto_wrap_fields,
+)
+
+
+class Client:
+    def __init__(self) -> None:
+        self.options = {"retries": 3}
+
+    def ping(self) -> str:
+        return "pong"
+
+
+def make_config_cls(depth: int = 1) -> type[ExplicitReinitSingleton]:
+    @auto_wrap_fields(depth=depth)
+    class Config(ExplicitReinitSingleton):
+        name = "default"
+
+        def __init__(self) -> None:
+            self.hosts = ["a", "b"]
+            self.client = Client()
+            self.port = 8080
+            self.callback = print
+
+    return Config
+
+
+def test_fields_are_proxied_and_cached():
+    Config = make_config_cls()
+    config = Config()
+
+    assert isinstance(config.hosts, SingletonFieldProxy)
+    assert config.hosts is config.hosts
+    assert config.hosts == ["a", "b"]
+    assert config.hosts[0] == "a"
+    assert len(config.hosts) == 2
+    assert config.client.ping() == "pong"
+    # vvv depth 1
+    assert type(config.client.options) is dict
+    assert config.port == 8080
+    assert config.callback is print
+    assert config.name == Config.name == "default"
+
+
+def test_proxies_are_invalidated():
+    Config = make_config_cls()
+    config = Config()
+    hosts = config.hosts
+    client = config.client
+
+    Config.reinit()
+
+    with pytest.raises(InvalidationError):
+        hosts[0]
+    with pytest.raises(InvalidationError):
+        client.ping
+
+    assert Config.get_instance().hosts == ["a", "b"]
+
+
+def test_proxy_of_leased_discarded_instance_is_invalidated():
+    Config = make_config_cls()
+    Config()
+
+    with Config.lease() as config:
+        Config.reinit()
+        hosts = config.hosts
+
+    with pytest.raises(InvalidationError):
+        hosts[0]
+
+
+def test_nested_proxies():
+    Config = make_config_cls(depth=2)
+    config = Config()
+    options = config.client.options
+
+    assert isinstance(options, SingletonFieldProxy)
+    assert options is config.client.options
+    assert options["retries"] == 3
+
+    Config.reinit()
+
+    with pytest.raises(InvalidationError):
+        options["retries"]
+
+
+def test_reassigned_field_gets_new_proxy():
+    Config = make_config_cls()
+    config = Config()
+    hosts = config.hosts
+
+    config.hosts = ["c"]
+    assert config.hosts is not hosts
+    assert config.hosts == ["c"]
+
+    del config.hosts
+
+    with pytest.raises(AttributeError):
+        config.hosts
+
+
+def test_only_explicit_reinit_singletons():
+    with pytest.raises(NotSubclsError):
+
+        @auto_wrap_fields()
+        class Foo(SimpleSingleton):
+            ...
@@ -0,0 +1,120 @@
+import asyncio
+import contextvars
+
+import pytest
+
+from safe_singleton.exceptions import InvalidationError
+from safe_singleton.more import (
+    ContextExplicitReinitSingleton,
+    ContextSingleton,
+    singleton_scope,
+)
+
+
+def test_instance_per_context():
+    class UnitOfWork(ContextSingleton):
+        ...
+
+    instance = UnitOfWork()
+    assert UnitOfWork() is instance
+    assert not contextvars.Context().run(UnitOfWork.instance_exists)
+    # vvv a copy inherits the instance
+    assert contextvars.copy_context().run(UnitOfWork.get_instance) is instance
+
+
+def test_tasks():
+    class UnitOfWork(ContextSingleton):
+        ...
+
+    async def handle_request() -> tuple[UnitOfWork, UnitOfWork]:
+        instance = await UnitOfWork.aget_instance()
+        child = asyncio.create_task(UnitOfWork.aget_instance())
+        return instance, await child
+
+    async def main() -> list[tuple[UnitOfWork, UnitOfWork]]:
+        return await asyncio.gather(handle_request(), handle_request())
+
+    (a, a_child), (b, b_child) = asyncio.run(main())
+    assert a is a_child
+    assert b is b_child
+    assert a is not b
+
+
+def test_singleton_scope():
+    class Cache(ContextExplicitReinitSingleton):
+        def __init__(self) -> None:
+            self.data = {}
+
+    class Session(ContextSingleton):
+        ...
+
+    outer = Cache()
+
+    with singleton_scope():
+        Cache.reinit()
+        inner = Cache.get_instance()
+        Session()
+
+    assert not Cache.instance_exists()
+    assert not Session.instance_exists()
+
+    with pytest.raises(InvalidationError):
+        inner.data
+    with pytest.raises(InvalidationError):
+        outer.data
+
+
+def test_singleton_scope_restores_outer_instance():
+    class Session(ContextSingleton):
+        ...
+
+    outer = Session()
+
+    with singleton_scope():
+        assert Session() is outer
+
+    assert Session.get_instance() is outer
+
+
+def test_singleton_scope_releases_child_task_instances():
+    class Cache(ContextExplicitReinitSingleton):
+        def __init__(self) -> None:
+            self.data = {}
+
+    async def main() -> Cache:
+        with singleton_scope():
+            return await asyncio.create_task(Cache.aget_instance())
+
+    instance = asyncio.run(main())
+
+    with pytest.raises(InvalidationError):
+        instance.data
+
+
+def test_field_refs_are_invalidated_per_context():
+    class Cache(ContextExplicitReinitSingleton):
+        def __init__(self) -> None:
+            self.data = {}
+
+    outer = Cache()
+    outer_ref = outer.wrap_attr(outer.data)
+
+    def reinit_in_copy() -> None:
+        inner = Cache.get_instance()
+        inner_ref = inner.wrap_attr(inner.data)
+        Cache.reinit()
+
+        with pytest.raises(InvalidationError):
+            inner_ref()
+
+    contextvars.copy_context().run(reinit_in_copy)
+    # vvv discarded in the copy only, it is still the current instance here
+    assert outer_ref.is_source_valid()
+
+    with singleton_scope():
+        Cache.reinit()
+        scoped = Cache.get_instance()
+        scoped_ref = scoped.wrap_attr(scoped.data)
+        assert scoped_ref() is scoped.data
+
+    assert not scoped_ref.is_source_valid()
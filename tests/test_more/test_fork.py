@@ -0,0 +1,166 @@
+import os
+from threading import RLock, Thread
+
+import pytest
+
+from safe_singleton.exceptions import InvalidationError
+from safe_singleton.more import (
+    ExplicitReinitSingleton,
+    ForkPolicy,
+    Multiton,
+    ThreadLocalSingleton,
+    fork_policy,
+)
+from safe_singleton.more import _meta
+from safe_singleton.more._fork import _after_fork_in_child
+
+
+class Resource(ExplicitReinitSingleton):
+    def __init__(self, name: str = "child") -> None:
+        self.name = name
+
+
+def test_keep():
+    @fork_policy(ForkPolicy.KEEP)
+    class Shared(Resource):
+        ...
+
+    instance = Shared("parent")
+    _after_fork_in_child()
+    assert Shared.get_instance() is instance
+    assert instance.name == "parent"
+
+
+def test_invalidate():
+    @fork_policy(ForkPolicy.INVALIDATE)
+    class Socket(Resource):
+        ...
+
+    instance = Socket("parent")
+    _after_fork_in_child()
+    assert not Socket.instance_exists()
+
+    with pytest.raises(InvalidationError):
+        instance.name
+
+
+def test_child_does_not_tear_down_inherited_instances():
+    @fork_policy(ForkPolicy.INVALIDATE)
+    class Socket(Resource):
+        torn_down = []
+
+        @classmethod
+        def _teardown_instance(cls, instance: "Socket") -> None:
+            cls.torn_down.append(instance)
+
+    leased = Socket("leased")
+
+    with Socket.lease():
+        Socket.reinit("parent")
+        current = Socket.get_instance()
+        # vvv as if the lease was held by another thread of the parent
+        _after_fork_in_child()
+
+        assert not Socket._instance_leases and not Socket._draining_instances
+
+        for instance in (leased, current):
+            with pytest.raises(InvalidationError):
+                instance.name
+
+    assert not Socket.torn_down
+    assert not Socket.__dict__.get("__singleton_skip_teardown__", False)
+
+
+def test_reinit_is_lazy():
+    @fork_policy(ForkPolicy.REINIT, args=("child",))
+    class Pool(Resource):
+        inits = 0
+
+        def __init__(self, name: str) -> None:
+            type(self).inits += 1
+            super().__init__(name)
+
+    Pool("parent")
+    _after_fork_in_child()
+    assert Pool.inits == 1
+
+    assert Pool.get_instance().name == "child"
+    assert Pool.inits == 2
+
+
+def test_policy_is_inherited():
+    @fork_policy(ForkPolicy.INVALIDATE)
+    class Base(Resource):
+        ...
+
+    class Child(Base):
+        ...
+
+    Child()
+    _after_fork_in_child()
+    assert not Child.instance_exists()
+
+
+def test_class_index_lock_held_at_fork():
+    lock = _meta._CLASS_INDEX_LOCK
+    # vvv as if held by another thread of the parent
+    lock.acquire()
+
+    try:
+        hook = Thread(target=_after_fork_in_child, daemon=True)
+        hook.start()
+        hook.join(5)
+        assert not hook.is_alive()
+    finally:
+        lock.release()
+
+
+def test_thread_local_lock_held_at_fork():
+    class Client(ThreadLocalSingleton):
+        ...
+
+    # vvv as if held by another thread of the parent
+    Client._thread_instances_lock.acquire()
+    _after_fork_in_child()
+
+    creation = Thread(target=Client, daemon=True)
+    creation.start()
+    creation.join(5)
+    assert not creation.is_alive()
+
+
+def test_multiton_key_lock_held_at_fork():
+    class Connection(Multiton):
+        ...
+
+    # vvv as if another thread of the parent was creating the instance
+    key_lock = Connection._key_locks["db"] = RLock()
+    key_lock.acquire()
+    _after_fork_in_child()
+
+    creation = Thread(target=Connection, args=("db",), daemon=True)
+    creation.start()
+    creation.join(5)
+    assert not creation.is_alive()
+    assert Connection.instance_exists("db")
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_real_fork():
+    @fork_policy(ForkPolicy.INVALIDATE)
+    class Socket(Resource):
+        ...
+
+    Socket("parent")
+    read_fd, write_fd = os.pipe()
+
+    if (pid := os.fork()) == 0:
+        os.close(read_fd)
+        os.write(write_fd, b"1" if Socket.instance_exists() else b"0")
+        os._exit(0)
+
+    os.close(write_fd)
+    assert os.read(read_fd, 1) == b"0"
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+    assert Socket.instance_exists()
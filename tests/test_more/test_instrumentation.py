@@ -0,0 +1,76 @@
+import pytest
+
+from safe_singleton.exceptions import ImplicitReinitError, InvalidationError
+from safe_singleton.more import (
+    ExplicitReinitSingleton,
+    ExplicitReinitWeakRefSingleton,
+    SingletonStats,
+    disable_instrumentation,
+    enable_instrumentation,
+    get_stats,
+    reset_stats,
+)
+
+
+@pytest.fixture
+def instrumentation():
+    reset_stats()
+    enable_instrumentation()
+    yield
+    disable_instrumentation()
+    reset_stats()
+
+
+def test_disabled_by_default():
+    class Foo(ExplicitReinitSingleton):
+        ...
+
+    Foo()
+    Foo.reinit()
+    assert get_stats(Foo) == SingletonStats()
+
+
+def test_counters(instrumentation):
+    class Foo(ExplicitReinitSingleton):
+        def __init__(self) -> None:
+            self.x = 1
+
+    first = Foo()
+
+    with pytest.raises(ImplicitReinitError):
+        Foo()
+
+    Foo.reinit()
+    Foo.invalidate_singleton()
+
+    with pytest.raises(InvalidationError):
+        first.x
+
+    stats = get_stats(Foo)
+    assert stats.creations == 2
+    assert stats.construction_time > 0
+    assert stats.reinits == 1
+    assert stats.invalidations == 1
+    assert stats.implicit_reinit_errors == 1
+    assert stats.invalidated_accesses == 1
+    assert stats.weakref_recreations == 0
+
+
+def test_weakref_recreations(instrumentation):
+    class Foo(ExplicitReinitWeakRefSingleton):
+        ...
+
+    Foo()
+    Foo()
+    assert get_stats(Foo).weakref_recreations == 1
+
+
+def test_switchable_at_runtime(instrumentation):
+    class Foo(ExplicitReinitSingleton):
+        ...
+
+    disable_instrumentation()
+    Foo()
+    enable_instrumentation()
+    Foo.reinit()
+    assert get_stats(Foo).creations == 1
@@ -1,3 +1,19 @@
+import gc
+import weakref
+from abc import ABC
+
+import pytest
+
+from safe_singleton.exceptions import InvalidationError, ResetAllError
+from safe_singleton.more import (
+    ExplicitReinitSingleton,
+    Multiton,
+    SimpleSingleton,
+    abstract_singleton,
+    live_singletons,
+    reset_all,
+    singleton_classes,
+)
 from safe_singleton.more._meta import SingletonMeta
 
 
@@ -6,3 +22,90 @@ def test_basic_singleton_definition_with_metaclass():
         ...
 
     Foo()
+
+
+def test_index_of_singleton_classes():
+    @abstract_singleton
+    class AbstractService(ExplicitReinitSingleton, ABC):
+        ...
+
+    class Service(AbstractService):
+        ...
+
+    class Cache(SimpleSingleton):
+        ...
+
+    class Client(Multiton):
+        def __init__(self, key: str) -> None:
+            ...
+
+    assert AbstractService not in singleton_classes()
+    assert singleton_classes(AbstractService) == [Service]
+    assert Cache in singleton_classes(SimpleSingleton)
+    assert Cache not in singleton_classes(ExplicitReinitSingleton)
+
+    service = Service()
+    Service.invalidate_singleton()
+    # vvv shadow classes are not indexed
+    assert type(service) not in singleton_classes()
+
+    cache, client = Cache(), Client("eu")
+    live = live_singletons()
+    assert cache in live and client in live
+
+
+def test_index_is_weak():
+    class Temporary(SimpleSingleton):
+        ...
+
+    ref = weakref.ref(Temporary)
+    del Temporary
+    gc.collect()
+    assert ref() is None
+
+
+def test_reset_all():
+    class Service(ExplicitReinitSingleton):
+        def __init__(self) -> None:
+            self.x = 1
+
+    class Cache(SimpleSingleton):
+        ...
+
+    class Client(Multiton):
+        def __init__(self, key: str) -> None:
+            self.key = key
+
+    service, _, client = Service(), Cache(), Client("eu")
+    reset_all()
+
+    assert not Service.instance_exists()
+    assert not Cache.instance_exists()
+    assert not Client.instance_exists("eu")
+
+    with pytest.raises(InvalidationError):
+        service.x
+    with pytest.raises(InvalidationError):
+        client.key
+
+
+def test_reset_all_collects_failures():
+    @abstract_singleton
+    class Failing(ExplicitReinitSingleton, ABC):
+        @classmethod
+        def _teardown_instance(cls, instance: "Failing") -> None:
+            raise RuntimeError(cls.__name__)
+
+    class A(Failing):
+        ...
+
+    class B(Failing):
+        ...
+
+    A(), B()
+
+    with pytest.raises(ResetAllError) as e:
+        reset_all(Failing)
+
+    assert sorted(str(error) for error in e.value.errors) == ["A", "B"]
+    assert not A.instance_exists() and not B.instance_exists()
@@ -1 +1,598 @@
-# TODO
+import asyncio
+import gc
+import sys
+from dataclasses import FrozenInstanceError
+from threading import Barrier, Event, Thread
+from time import sleep
+
+import pytest
+
+from safe_singleton.exceptions import ImplicitReinitError, InvalidationError
+from safe_singleton.more import (
+    EnsureInitSingleton,
+    EnsureInitWeakRefSingleton,
+    ExplicitReinitSingleton,
+    ExplicitReinitWeakRefSingleton,
+    NoImplicitReinitSingleton,
+    NoImplicitReinitWeakRefSingleton,
+    SimpleSingleton,
+    SimpleWeakRefSingleton,
+)
+from safe_singleton.more._base import no_invalidation_error
+
+
+def race(target, n_threads: int = 8) -> list:
+    """
+    Runs `target` in `n_threads` threads at once, returns their results.
+    """
+
+    barrier = Barrier(n_threads)
+    results = []
+
+    def run():
+        barrier.wait()
+        results.append(target())
+
+    threads = [Thread(target=run) for _ in range(n_threads)]
+
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    return results
+
+
+def test_single_flight_creation():
+    class Slow(SimpleSingleton):
+        inits = 0
+
+        def __init__(self) -> None:
+            type(self).inits += 1
+            sleep(0.01)
+
+    results = race(Slow)
+    assert Slow.inits == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_single_flight_no_spurious_implicit_reinit():
+    class Slow(NoImplicitReinitSingleton):
+        def __init__(self) -> None:
+            sleep(0.01)
+
+    results = race(Slow)
+    assert all(r is results[0] for r in results)
+
+
+def test_single_flight_fast_path_race():
+    # Threads are switched as often as possible, so some of them check the fast
+    # path right while the winner registers its instance.
+    def cold_race() -> list[Exception]:
+        class Slow(NoImplicitReinitSingleton):
+            initializing = False
+
+            def __init__(self) -> None:
+                type(self).initializing = True
+                sleep(0.001)
+                type(self).initializing = False
+
+        errors = []
+
+        def create():
+            try:
+                Slow()
+            except ImplicitReinitError as e:
+                # vvv a reinit attempt only once the winner is done is expected
+                if Slow.initializing:
+                    errors.append(e)
+
+        race(create)
+        return errors
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+
+    try:
+        assert not [e for _ in range(300) for e in cold_race()]
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+
+def test_failed_init_does_not_leave_instance():
+    class Flaky(NoImplicitReinitSingleton):
+        fail = True
+
+        def __init__(self) -> None:
+            if type(self).fail:
+                raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        Flaky()
+
+    assert not Flaky.instance_exists()
+    Flaky.fail = False
+    assert Flaky() is Flaky.get_instance()
+
+
+def test_weakref_singleton_recreated_after_death():
+    class Weak(NoImplicitReinitWeakRefSingleton):
+        ...
+
+    Weak()
+    assert not Weak.instance_exists()
+    instance = Weak()
+    assert Weak.get_instance() is instance
+
+
+def test_simple_weakref_singleton_get_instance_as_ref():
+    class Weak(SimpleWeakRefSingleton):
+        ...
+
+    instance = Weak()
+    assert Weak() is instance
+    assert Weak.get_instance_as_ref()() is instance
+
+
+@pytest.mark.parametrize(
+    "base", [ExplicitReinitSingleton, ExplicitReinitWeakRefSingleton]
+)
+def test_invalidated_instance_raises(base: type[ExplicitReinitSingleton]):
+    class Foo(base):  # type: ignore
+        def __init__(self) -> None:
+            self.x = 1
+
+    first = Foo()
+    assert first.x == 1
+    assert first.is_instance_valid()
+
+    second = Foo.reinit()
+    assert second.x == 1
+    assert second.is_instance_valid()
+    assert not first.is_instance_valid()
+    assert isinstance(first, Foo)
+
+    with pytest.raises(InvalidationError):
+        first.x
+
+
+def test_live_instance_has_plain_attribute_access():
+    class Foo(ExplicitReinitSingleton):
+        ...
+
+    assert type(Foo()).__getattribute__ is object.__getattribute__
+
+
+def test_no_invalidation_error_keeps_instance_usable():
+    @no_invalidation_error
+    class Foo(ExplicitReinitSingleton):
+        def __init__(self) -> None:
+            self.x = 1
+
+    first = Foo()
+    Foo.invalidate_singleton()
+    assert first.x == 1
+    assert not first.is_instance_valid()
+
+
+def test_no_invalidation_error_has_plain_attribute_access():
+    @no_invalidation_error
+    class Foo(ExplicitReinitSingleton):
+        ...
+
+    class Bar(Foo):
+        ...
+
+    for cls in (Foo, Bar):
+        first = cls()
+        second = cls.reinit()
+        assert type(first) is cls
+        assert type(first).__getattribute__ is object.__getattribute__
+        assert not first.is_instance_valid()
+        assert second.is_instance_valid()
+
+
+def test_aget_instance_single_flight():
+    class Client(ExplicitReinitSingleton):
+        creations = 0
+
+        @classmethod
+        async def _acreate_instance(cls) -> "Client":
+            cls.creations += 1
+            await asyncio.sleep(0.01)
+            return cls()
+
+    async def main():
+        return await asyncio.gather(*(Client.aget_instance() for _ in range(10)))
+
+    results = asyncio.run(main())
+    assert Client.creations == 1
+    assert all(r is Client.get_instance() for r in results)
+
+
+def test_areinit_and_ainvalidate_singleton():
+    class Client(ExplicitReinitSingleton):
+        ...
+
+    async def main():
+        first = await Client.aget_instance()
+        second = await Client.areinit()
+        assert first is not second
+        assert not first.is_instance_valid()
+        assert second.is_instance_valid()
+
+        await Client.ainvalidate_singleton()
+        assert not Client.instance_exists()
+
+    asyncio.run(main())
+
+
+def test_reinit_async_serves_old_instance_until_swap():
+    building = Event()
+    release = Event()
+
+    class Config(ExplicitReinitSingleton):
+        def __init__(self, version: int) -> None:
+            if version > 0:
+                building.set()
+                release.wait(5)
+
+            self.version = version
+
+    old = Config(0)
+    future = Config.reinit_async(1)
+    building.wait(5)
+
+    assert Config.get_instance() is old
+    assert old.version == 0
+
+    release.set()
+    new = future.result(5)
+    assert new.version == 1
+    assert Config.get_instance() is new
+    assert not old.is_instance_valid()
+
+
+def test_reinit_async_last_call_wins():
+    release = Event()
+
+    class Config(ExplicitReinitSingleton):
+        def __init__(self, version: int, wait: bool = False) -> None:
+            if wait:
+                release.wait(5)
+
+            self.version = version
+
+    Config(0)
+    slow = Config.reinit_async(1, wait=True)
+    fast = Config.reinit_async(2)
+    assert fast.result(5).version == 2
+
+    release.set()
+    assert slow.result(5) is fast.result()
+    assert Config.get_instance().version == 2
+
+
+def test_reinit_async_failure_keeps_old_instance():
+    class Config(ExplicitReinitSingleton):
+        def __init__(self, fail: bool = False) -> None:
+            if fail:
+                raise RuntimeError
+
+    old = Config()
+
+    with pytest.raises(RuntimeError):
+        Config.reinit_async(fail=True).result(5)
+
+    assert Config.get_instance() is old
+    assert old.is_instance_valid()
+
+
+def make_pool_cls() -> type[ExplicitReinitSingleton]:
+    class Pool(ExplicitReinitSingleton):
+        def __init__(self, version: int = 0) -> None:
+            self.version = version
+            self.closed = False
+
+        @classmethod
+        def _teardown_instance(cls, instance: "Pool") -> None:
+            instance.closed = True
+
+    return Pool
+
+
+def test_lease_drains_old_instance():
+    Pool = make_pool_cls()
+    old = Pool(0)
+
+    with Pool.lease() as leased:
+        assert leased is old
+
+        with Pool.lease():
+            Pool.reinit(1)
+
+        # vvv still leased by the outer block
+        assert not old.closed
+        assert leased.version == 0
+        assert not old.is_instance_valid()
+
+        with Pool.lease() as new:
+            assert new.version == 1
+
+    assert object.__getattribute__(old, "closed")
+
+    with pytest.raises(InvalidationError):
+        old.version
+
+    assert Pool.get_instance().version == 1
+    assert not Pool._instance_leases and not Pool._draining_instances
+
+
+def test_unleased_instance_is_torn_down_right_away():
+    Pool = make_pool_cls()
+    old = Pool()
+    Pool.invalidate_singleton()
+    assert object.__getattribute__(old, "closed")
+
+
+@pytest.mark.parametrize(
+    "base", [SimpleSingleton, ExplicitReinitSingleton, ExplicitReinitWeakRefSingleton]
+)
+def test_lazy_initializes_on_first_access(base: type[SimpleSingleton]):
+    class Foo(base):  # type: ignore
+        inits = 0
+
+        def __init__(self, x: int) -> None:
+            type(self).inits += 1
+            self.x = x
+
+    instance = Foo.lazy(1)
+    assert Foo.inits == 0
+    assert Foo.lazy(2) is instance
+    assert Foo.get_instance() is instance
+
+    assert instance.x == 1
+    assert Foo.inits == 1
+    assert type(instance) is Foo
+    assert type(instance).__getattribute__ is object.__getattribute__
+
+
+def test_lazy_instance_reinit_before_first_access():
+    class Foo(ExplicitReinitSingleton):
+        def __init__(self, x: int = 0) -> None:
+            self.x = x
+
+    lazy = Foo.lazy(1)
+    fresh = Foo.reinit(2)
+    assert fresh.x == 2
+
+    with pytest.raises(InvalidationError):
+        lazy.x
+
+
+def test_lazy_instance_explicit_init():
+    class Foo(SimpleSingleton):
+        def __init__(self, x: int) -> None:
+            self.x = x
+
+    lazy = Foo.lazy(1)
+    assert Foo(2) is lazy
+    assert lazy.x == 2
+
+
+def test_lazy_instance_concurrent_first_access():
+    initializing = Event()
+
+    class Slow(SimpleSingleton):
+        inits = 0
+
+        def __init__(self) -> None:
+            type(self).inits += 1
+            initializing.set()
+            # vvv reads its own attributes while still being initialized
+            assert self.instance_exists()
+            sleep(0.05)
+            self.x = 1
+
+    lazy = Slow.lazy()
+    first = Thread(target=lambda: lazy.x)
+    first.start()
+    initializing.wait(5)
+
+    assert lazy.x == 1
+    first.join()
+    assert Slow.inits == 1
+    assert type(lazy) is Slow
+
+
+def test_lazy_instance_failed_init_is_retried():
+    class Flaky(ExplicitReinitSingleton):
+        fail = True
+
+        def __init__(self) -> None:
+            if type(self).fail:
+                raise RuntimeError
+
+            self.x = 1
+
+    lazy = Flaky.lazy()
+
+    with pytest.raises(RuntimeError):
+        lazy.x
+
+    Flaky.fail = False
+    assert lazy.x == 1
+    assert Flaky.get_instance() is lazy
+
+
+@pytest.mark.parametrize("base", [EnsureInitSingleton, EnsureInitWeakRefSingleton])
+def test_ensure_init_singleton(base: type[EnsureInitSingleton]):
+    class Foo(base):  # type: ignore
+        def __init__(self, fail: bool = False) -> None:
+            if fail:
+                raise ValueError
+            self.x = 1
+
+    first = Foo()
+    assert first.x == 1
+    assert Foo.reinit().x == 1
+    assert not first.is_instance_valid()
+
+    Foo.invalidate_singleton()
+    with pytest.raises(ValueError):
+        Foo(fail=True)
+    assert not Foo.instance_exists()
+
+
+def test_ensure_init_subclass_defined_after_base_instance():
+    class Base(EnsureInitSingleton):
+        def __init__(self) -> None:
+            self.a = 1
+
+    Base()
+
+    class Child(Base):
+        def __init__(self) -> None:
+            self.b = 2
+
+    child = Child()
+    assert child.a == 1 and child.b == 2
+    assert Base.get_instance().a == 1
+
+
+def test_ensure_init_first_instance_from_reinit_async():
+    class Base(EnsureInitSingleton):
+        def __init__(self) -> None:
+            self.a = 1
+
+    class Child(Base):
+        def __init__(self) -> None:
+            self.b = 2
+
+    child = Child.reinit_async().result(5)
+    assert child.a == 1 and child.b == 2
+    assert Child.get_instance() is child
+
+
+def test_shadow_classes_skip_init_subclass_hooks():
+    plugins = []
+
+    class Plugin(ExplicitReinitSingleton):
+        def __init_subclass__(cls, *, name: str, **kwds) -> None:
+            super().__init_subclass__(**kwds)
+            plugins.append((name, cls))
+
+    class Exporter(Plugin, name="exporter"):
+        ...
+
+    lazy = Exporter.lazy()
+    assert type(lazy).__singleton_shadow_of__ is Exporter
+    assert lazy.is_instance_valid()
+
+    invalidated = Exporter.get_instance()
+    Exporter.reinit()
+    assert type(invalidated).__singleton_shadow_of__ is Exporter
+    assert Exporter.__singleton_shadow_of__ is Exporter
+    assert plugins == [("exporter", Exporter)]
+
+    class Importer(Exporter, name="importer"):
+        ...
+
+    assert plugins[-1] == ("importer", Importer)
+    assert "__init_subclass__" not in Exporter.__dict__
+
+
+def test_field_refs():
+    class Config(ExplicitReinitSingleton):
+        def __init__(self) -> None:
+            self.hosts = ["a", "b"]
+
+    config = Config()
+    strong = config.wrap_attr(config.hosts)
+    weak = config.wrap_attr_weak(config.hosts)
+
+    assert strong() is weak() is config.hosts
+    assert strong.forward_ref(1)() == weak.forward_ref(1)() == 1
+    assert strong == config.wrap_attr(config.hosts)
+    assert weak.as_strong() == strong and strong.as_weak() == weak
+    assert not hasattr(strong, "__dict__") and not hasattr(weak, "__dict__")
+
+    with pytest.raises(FrozenInstanceError):
+        strong._wrapped = None
+
+    forwarded = strong.forward_ref(config.hosts[0])
+    Config.reinit()
+
+    for invalidated in (strong, weak, forwarded):
+        assert not invalidated.is_source_valid()
+
+        with pytest.raises(InvalidationError):
+            invalidated()
+
+    with pytest.raises(InvalidationError):
+        strong.forward_ref(1)
+
+    new = Config.get_instance()
+    assert new.wrap_attr(new.hosts)() is new.hosts
+
+
+def test_field_ref_of_discarded_instance_is_invalid():
+    @no_invalidation_error
+    class Config(ExplicitReinitSingleton):
+        def __init__(self) -> None:
+            self.hosts = ["a", "b"]
+
+    old = Config()
+    Config.reinit()
+    ref = old.wrap_attr(old.hosts)
+    assert not ref.is_source_valid()
+
+    with pytest.raises(InvalidationError):
+        ref()
+
+
+@pytest.mark.parametrize(
+    "base", [ExplicitReinitSingleton, ExplicitReinitWeakRefSingleton]
+)
+def test_field_ref_created_by_detached_init(base: type[ExplicitReinitSingleton]):
+    release = Event()
+
+    class Config(base):  # type: ignore
+        def __init__(self, version: int, wait: bool = False) -> None:
+            if wait:
+                release.wait(5)
+
+            self.hosts = [version]
+            self.hosts_ref = self.wrap_attr(self.hosts)
+
+    old_ref = Config(0).hosts_ref
+    slow = Config.reinit_async(1, wait=True)
+    new = Config.reinit_async(2).result(5)
+
+    assert new.hosts_ref() == [2]
+    assert not old_ref.is_source_valid()
+
+    release.set()
+    assert slow.result(5) is new
+    assert new.hosts_ref.is_source_valid()
+    # vvv the superseded instance has released its generation
+    assert not Config._detached_generations
+
+
+def test_field_ref_invalidated_by_swap_and_collection():
+    class Config(ExplicitReinitWeakRefSingleton):
+        ...
+
+    config = Config()
+    ref = config.wrap_attr_weak(1)
+    new = Config._swap_instance(Config._build_detached_instance())
+
+    with pytest.raises(InvalidationError):
+        ref()
+
+    ref = new.wrap_attr_weak(1)
+    del config, new
+    gc.collect()
+
+    with pytest.raises(InvalidationError):
+        ref()
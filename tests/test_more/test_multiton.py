@@ -0,0 +1,146 @@
+from threading import Barrier, Thread
+from time import sleep
+
+import pytest
+
+from safe_singleton.exceptions import (
+    AbstractSingletonInitError,
+    InvalidationError,
+    NoInstanceError,
+)
+from safe_singleton.more import EvictionPolicy, Multiton
+
+
+class Client(Multiton):
+    def __init__(self, region: str, timeout: float = 1.0) -> None:
+        self.region = region
+        self.timeout = timeout
+
+
+def test_abstract():
+    with pytest.raises(AbstractSingletonInitError):
+        Multiton("key")
+
+
+def test_instance_per_key():
+    eu = Client("eu")
+    assert Client("eu") is eu
+    assert Client.get_instance("eu") is eu
+    assert Client("us") is not eu
+    assert set(Client.keys()) >= {"eu", "us"}
+
+    with pytest.raises(NoInstanceError):
+        Client.get_instance("asia")
+
+
+def test_existing_instance_is_not_reinitialized():
+    instance = Client("pl", timeout=2.0)
+    Client("pl", timeout=3.0)
+    assert instance.timeout == 2.0
+
+
+def test_single_flight_per_key():
+    class Slow(Multiton):
+        inits = 0
+
+        def __init__(self, key: str) -> None:
+            type(self).inits += 1
+            sleep(0.01)
+
+    n_threads = 8
+    barrier = Barrier(n_threads)
+    results = []
+
+    def run(key: str) -> None:
+        barrier.wait()
+        results.append(Slow(key))
+
+    threads = [Thread(target=run, args=(str(i % 2),)) for i in range(n_threads)]
+
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert Slow.inits == 2
+    assert len(set(map(id, results))) == 2
+
+
+def test_failed_init_leaves_no_instance():
+    class Flaky(Multiton):
+        fail = True
+
+        def __init__(self, key: str) -> None:
+            if type(self).fail:
+                raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        Flaky("key")
+
+    assert not Flaky.instance_exists("key")
+    Flaky.fail = False
+    assert Flaky("key") is Flaky.get_instance("key")
+
+
+def test_lru_eviction():
+    evicted = []
+
+    class Bounded(Multiton):
+        __multiton_maxsize__ = 2
+
+        def __init__(self, key: str) -> None:
+            ...
+
+        @classmethod
+        def _on_evict(cls, key, instance) -> None:
+            evicted.append(key)
+
+    a = Bounded("a")
+    Bounded("b")
+    Bounded("a")
+    Bounded("c")
+
+    assert evicted == ["b"]
+    assert Bounded.keys() == ["a", "c"]
+    assert a.is_instance_valid()
+
+
+def test_lfu_eviction():
+    class Bounded(Multiton):
+        __multiton_maxsize__ = 2
+        __multiton_eviction__ = EvictionPolicy.LFU
+
+        def __init__(self, key: str) -> None:
+            ...
+
+    Bounded("a")
+    b = Bounded("b")
+    Bounded("a")
+    Bounded("a")
+    Bounded("b")
+    Bounded("c")
+    Bounded("c")
+    Bounded("d")
+
+    assert sorted(Bounded.keys()) == ["a", "d"]
+    assert not b.is_instance_valid()
+
+
+def test_reinit_and_invalidate_per_key():
+    old = Client("de")
+    other = Client("fr")
+
+    new = Client.reinit("de", timeout=5.0)
+    assert new is not old
+    assert new.timeout == 5.0
+    assert not old.is_instance_valid()
+    assert other.is_instance_valid()
+
+    with pytest.raises(InvalidationError):
+        old.region
+
+    Client.invalidate_singleton("fr")
+    assert not Client.instance_exists("fr")
+
+    with pytest.raises(InvalidationError):
+        other.region
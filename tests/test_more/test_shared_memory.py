@@ -0,0 +1,148 @@
+import multiprocessing
+from time import sleep
+from uuid import uuid4
+
+import pytest
+
+from safe_singleton.more import SharedStateSingleton
+from safe_singleton.more._shared_memory import _create, _unlink
+
+
+@pytest.fixture
+def table_cls():
+    class Table(SharedStateSingleton):
+        __singleton_shared_name__ = f"ss_test_{uuid4().hex[:12]}"
+        builds = 0
+
+        @classmethod
+        def _build_shared_state(cls) -> bytes:
+            cls.builds += 1
+            return f"table-{cls.builds}".encode()
+
+    yield Table
+    Table.unlink_shared_state()
+
+
+def test_first_instance_builds_and_publishes(table_cls):
+    table = table_cls()
+    assert table_cls.builds == 1
+    assert bytes(table.shared_state) == b"table-1"
+    assert table.shared_state.readonly
+
+
+def test_other_instances_attach(table_cls):
+    table_cls()
+
+    class Attached(SharedStateSingleton):
+        __singleton_shared_name__ = table_cls.__singleton_shared_name__
+
+        @classmethod
+        def _build_shared_state(cls) -> bytes:
+            raise AssertionError("should attach instead")
+
+    assert bytes(Attached().shared_state) == b"table-1"
+
+
+def test_reinit_publishes_new_generation(table_cls):
+    first = table_cls()
+
+    class Reader(SharedStateSingleton):
+        __singleton_shared_name__ = table_cls.__singleton_shared_name__
+
+        @classmethod
+        def _build_shared_state(cls) -> bytes:
+            raise AssertionError("should attach instead")
+
+    reader = Reader()
+    second = table_cls.reinit()
+
+    assert not first.is_instance_valid()
+    assert second.shared_state_generation == 2
+    assert bytes(second.shared_state) == b"table-2"
+    assert bytes(reader.shared_state) == b"table-2"
+    assert reader.shared_state_generation == 2
+
+
+def test_reinit_keeps_publish_flag(table_cls):
+    table_cls.__singleton_shared_publish__ = True
+    table_cls()
+    table_cls.reinit()
+
+    assert table_cls.__singleton_shared_publish__
+    table_cls.invalidate_singleton()
+    assert table_cls().shared_state_generation == 3
+
+
+def test_only_rebuilds_publish(table_cls):
+    table_cls()
+    table_cls.reinit()
+    table_cls.invalidate_singleton()
+
+    assert table_cls().shared_state_generation == 2
+    assert table_cls.builds == 2
+
+
+def test_reinit_async_publishes_new_generation(table_cls):
+    table_cls()
+    new = table_cls.reinit_async().result(5)
+
+    assert new.shared_state_generation == 2
+    assert bytes(new.shared_state) == b"table-2"
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="requires fork"
+)
+def test_processes_started_together_build_once():
+    context = multiprocessing.get_context("fork")
+    n_processes = 4
+    builds = context.Value("i", 0)
+    barrier = context.Barrier(n_processes)
+    results = context.Queue()
+
+    class Table(SharedStateSingleton):
+        __singleton_shared_name__ = f"ss_test_{uuid4().hex[:12]}"
+
+        @classmethod
+        def _build_shared_state(cls) -> bytes:
+            with builds.get_lock():
+                builds.value += 1
+
+            # vvv the others start in the meantime
+            sleep(0.2)
+            return b"table"
+
+    def worker() -> None:
+        barrier.wait()
+        results.put(bytes(Table().shared_state))
+
+    processes = [context.Process(target=worker) for _ in range(n_processes)]
+
+    try:
+        for p in processes:
+            p.start()
+
+        assert [results.get(timeout=10) for _ in processes] == [b"table"] * n_processes
+    finally:
+        for p in processes:
+            p.join()
+
+        Table.unlink_shared_state()
+
+    assert all(p.exitcode == 0 for p in processes)
+    assert builds.value == 1
+
+
+def test_dead_publisher_times_out(table_cls):
+    table_cls.__singleton_shared_timeout__ = 0.05
+    claim = f"{table_cls.__singleton_shared_name__}.1.claim"
+    # vvv as if claimed by a process that has died
+    _create(claim, 8)
+
+    try:
+        with pytest.raises(TimeoutError):
+            table_cls()
+    finally:
+        _unlink(claim)
+
+    assert table_cls.builds == 0
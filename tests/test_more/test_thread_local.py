@@ -0,0 +1,116 @@
+import gc
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, Thread
+from weakref import ref
+
+import pytest
+
+from safe_singleton.exceptions import InvalidationError
+from safe_singleton.more import (
+    ThreadLocalExplicitReinitSingleton,
+    ThreadLocalSingleton,
+)
+
+
+def in_thread(f):
+    with ThreadPoolExecutor(1) as executor:
+        return executor.submit(f).result()
+
+
+def test_instance_per_thread():
+    class Cursor(ThreadLocalSingleton):
+        ...
+
+    instance = Cursor()
+    assert Cursor() is instance
+    assert Cursor.get_instance() is instance
+
+    other = in_thread(Cursor)
+    assert isinstance(other, Cursor)
+    assert other is not instance
+
+
+def test_no_instance_in_other_thread():
+    class Cursor(ThreadLocalSingleton):
+        ...
+
+    Cursor()
+    assert not in_thread(Cursor.instance_exists)
+
+
+def test_dead_thread_instance_is_released():
+    class Cursor(ThreadLocalSingleton):
+        ...
+
+    refs = []
+    thread = Thread(target=lambda: refs.append(ref(Cursor())))
+    thread.start()
+    thread.join()
+    gc.collect()
+
+    assert refs[0]() is None
+    assert not Cursor._thread_instances
+
+
+def test_reinit_invalidates_all_threads():
+    class Parser(ThreadLocalExplicitReinitSingleton):
+        def __init__(self, version: int = 0) -> None:
+            self.version = version
+
+    other = in_thread(Parser)
+    instance = Parser()
+
+    new_instance = Parser.reinit(1)
+    assert new_instance.version == 1
+    assert not in_thread(Parser.instance_exists)
+
+    for invalidated in (instance, other):
+        with pytest.raises(InvalidationError):
+            invalidated.version
+
+
+def test_invalidation_right_after_registration():
+    class HandOffLock:
+        """
+        Runs `hand_off` in another thread right after being released.
+        """
+
+        def __init__(self) -> None:
+            self.lock = Lock()
+            self.hand_off = None
+
+        def __enter__(self) -> None:
+            self.lock.acquire()
+
+        def __exit__(self, *_) -> None:
+            self.lock.release()
+
+            if (hand_off := self.hand_off) is not None:
+                self.hand_off = None
+                in_thread(hand_off)
+
+    class Cursor(ThreadLocalExplicitReinitSingleton):
+        ...
+
+    Cursor._thread_instances_lock = HandOffLock()
+    Cursor._thread_instances_lock.hand_off = Cursor.invalidate_singleton
+    instance = Cursor()
+
+    assert not Cursor.instance_exists()
+    assert not instance.is_instance_valid()
+    assert Cursor() is not instance
+
+
+def test_failed_init_in_one_thread():
+    class Client(ThreadLocalSingleton):
+        def __init__(self, fail: bool = False) -> None:
+            if fail:
+                raise RuntimeError
+
+    instance = Client()
+
+    with pytest.raises(RuntimeError):
+        in_thread(lambda: Client(fail=True))
+
+    assert Client.get_instance() is instance
+    assert list(Client._thread_instances) == [instance]
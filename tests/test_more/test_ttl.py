@@ -0,0 +1,181 @@
+import os
+from collections.abc import Iterator
+from time import sleep
+
+import pytest
+
+from safe_singleton.exceptions import InvalidationError
+from safe_singleton.more import RefreshPolicy, TTLSingleton
+
+
+TTL = 0.05
+
+
+def wait_until(condition, timeout: float = 2.0) -> None:
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+
+        sleep(0.01)
+
+    raise TimeoutError
+
+
+@pytest.fixture
+def cls_factory() -> Iterator:
+    classes = []
+
+    def make_cls(policy: RefreshPolicy = RefreshPolicy.KEEP_STALE) -> type:
+        class Credentials(TTLSingleton):
+            __singleton_ttl__ = TTL
+            __singleton_refresh_policy__ = policy
+            __singleton_refresh_backoff__ = 0.01
+            builds = 0
+            fail = False
+
+            def __init__(self, token: str) -> None:
+                cls = type(self)
+                cls.builds += 1
+
+                if cls.fail:
+                    raise RuntimeError
+
+                self.token = token
+
+        classes.append(Credentials)
+        return Credentials
+
+    yield make_cls
+
+    for cls in classes:
+        cls.stop_refreshing(timeout=1)
+
+
+def test_refreshed_in_background(cls_factory):
+    Credentials = cls_factory()
+    stale = Credentials("secret")
+    wait_until(lambda: Credentials.get_instance() is not stale)
+
+    fresh = Credentials.get_instance()
+    assert fresh.token == "secret"
+    assert Credentials.expires_in() > 0
+
+    with pytest.raises(InvalidationError):
+        stale.token
+
+
+def test_keep_stale_on_failure(cls_factory):
+    Credentials = cls_factory(RefreshPolicy.KEEP_STALE)
+    stale = Credentials("secret")
+    Credentials.fail = True
+    wait_until(lambda: Credentials.builds >= 2)
+
+    assert Credentials.get_instance() is stale
+    assert stale.token == "secret"
+
+
+def test_retry_on_failure(cls_factory):
+    Credentials = cls_factory(RefreshPolicy.RETRY)
+    stale = Credentials("secret")
+    Credentials.fail = True
+    wait_until(lambda: Credentials.builds >= 4)
+
+    assert Credentials.get_instance() is stale
+    Credentials.fail = False
+    wait_until(lambda: Credentials.get_instance() is not stale)
+
+
+def test_invalidate_on_failure(cls_factory):
+    Credentials = cls_factory(RefreshPolicy.INVALIDATE)
+    stale = Credentials("secret")
+    Credentials.fail = True
+    wait_until(lambda: not Credentials.instance_exists())
+
+    with pytest.raises(InvalidationError):
+        stale.token
+
+    Credentials.fail = False
+    assert Credentials("new").token == "new"
+
+
+def test_instance_created_while_refresher_exits_is_refreshed(cls_factory):
+    Credentials = cls_factory(RefreshPolicy.INVALIDATE)
+    created = []
+
+    def teardown(instance) -> None:
+        # vvv runs in the refresher thread, right before it would exit
+        if not created:
+            Credentials.fail = False
+            created.append(Credentials("new"))
+
+    Credentials._teardown_instance = staticmethod(teardown)
+    Credentials("secret")
+    Credentials.fail = True
+    wait_until(lambda: created)
+
+    wait_until(lambda: Credentials.get_instance() is not created[0])
+    assert Credentials.get_instance().token == "new"
+
+
+def test_reinit_uses_new_arguments(cls_factory):
+    Credentials = cls_factory()
+    Credentials("old")
+    Credentials.reinit("new")
+    first = Credentials.get_instance()
+    wait_until(lambda: Credentials.get_instance() is not first)
+
+    assert Credentials.get_instance().token == "new"
+
+
+
+def test_reinit_async_uses_new_arguments(cls_factory):
+    Credentials = cls_factory()
+    Credentials("old")
+    Credentials.reinit_async("new").result(5)
+
+    wait_until(lambda: Credentials.builds >= 3)
+    assert Credentials.get_instance().token == "new"
+
+
+def test_first_instance_from_reinit_async_is_refreshed(cls_factory):
+    Credentials = cls_factory()
+    first = Credentials.reinit_async("token").result(5)
+
+    wait_until(lambda: Credentials.get_instance() is not first)
+    assert Credentials.get_instance().token == "token"
+
+
+
+def test_field_ref_created_by_refreshed_init(cls_factory):
+    class Credentials(cls_factory()):
+        def __init__(self, token: str) -> None:
+            super().__init__(token)
+            self.token_ref = self.wrap_attr(self.token)
+
+    stale = Credentials("token")
+    wait_until(lambda: Credentials.get_instance() is not stale)
+    assert Credentials.get_instance().token_ref() == "token"
+    Credentials.stop_refreshing(timeout=1)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_refreshed_in_forked_child(cls_factory):
+    Credentials = cls_factory()
+    stale = Credentials("token")
+    read_fd, write_fd = os.pipe()
+
+    if (pid := os.fork()) == 0:
+        refreshed = b"0"
+
+        try:
+            os.close(read_fd)
+            wait_until(lambda: Credentials.get_instance() is not stale)
+            refreshed = b"1"
+        finally:
+            os.write(write_fd, refreshed)
+            os._exit(0)
+
+    os.close(write_fd)
+    assert os.read(read_fd, 1) == b"1"
+    os.close(read_fd)
+    os.waitpid(pid, 0)
@@ -0,0 +1,112 @@
+import asyncio
+from threading import Barrier
+from time import sleep
+
+from safe_singleton.more import (
+    ExplicitReinitSingleton,
+    SimpleSingleton,
+    awarm_up,
+    depends_on,
+    warm_up,
+)
+
+
+def test_dependencies_are_built_first():
+    order = []
+
+    class Config(ExplicitReinitSingleton):
+        def __init__(self) -> None:
+            order.append(type(self))
+
+    @depends_on(Config)
+    class Database(ExplicitReinitSingleton):
+        def __init__(self) -> None:
+            assert Config.instance_exists()
+            order.append(type(self))
+
+    report = warm_up([Database])
+
+    assert report.ok
+    assert order == report.built == [Config, Database]
+    assert report.critical_path == [Config, Database]
+    assert Database.instance_exists()
+
+
+def test_independent_singletons_are_built_concurrently():
+    barrier = Barrier(2, timeout=5)
+
+    class A(ExplicitReinitSingleton):
+        def __init__(self) -> None:
+            barrier.wait()
+
+    class B(ExplicitReinitSingleton):
+        def __init__(self) -> None:
+            barrier.wait()
+
+    assert warm_up([A, B], max_workers=2).ok
+
+
+def test_failure_skips_dependents_only():
+    class Broken(ExplicitReinitSingleton):
+        def __init__(self) -> None:
+            raise RuntimeError
+
+    class Dependent(ExplicitReinitSingleton):
+        ...
+
+    class Independent(ExplicitReinitSingleton):
+        ...
+
+    report = warm_up([Dependent, Independent], dependencies={Dependent: [Broken]})
+
+    assert isinstance(report.failed[Broken], RuntimeError)
+    assert report.skipped == [Dependent]
+    assert report.built == [Independent]
+    # vvv the half-initialized instance is not left behind
+    assert not Broken.instance_exists()
+    assert not Dependent.instance_exists()
+
+
+def test_lazy_instance_is_initialized():
+    class Client(SimpleSingleton):
+        def __init__(self, url: str) -> None:
+            self.url = url
+
+    instance = Client.lazy("localhost")
+    assert warm_up([Client]).ok
+    assert object.__getattribute__(instance, "url") == "localhost"
+
+
+def test_critical_path_time():
+    class Slow(ExplicitReinitSingleton):
+        def __init__(self) -> None:
+            sleep(0.02)
+
+    @depends_on(Slow)
+    class Slower(ExplicitReinitSingleton):
+        def __init__(self) -> None:
+            sleep(0.03)
+
+    class Fast(ExplicitReinitSingleton):
+        ...
+
+    report = warm_up([Slower, Fast])
+    assert report.critical_path == [Slow, Slower]
+    assert report.critical_path_time >= 0.05
+
+
+def test_awarm_up():
+    class Config(ExplicitReinitSingleton):
+        ...
+
+    @depends_on(Config)
+    class Cache(ExplicitReinitSingleton):
+        @classmethod
+        async def _acreate_instance(cls, *args, **kwds):
+            assert Config.instance_exists()
+            await asyncio.sleep(0)
+            return cls()
+
+    report = asyncio.run(awarm_up([Cache]))
+    assert report.built == [Config, Cache]
+    assert Cache.instance_exists()
@@ -0,0 +1,158 @@
+from threading import Barrier, Thread
+
+import pytest
+
+from safe_singleton.utils.registry import ConcurrentRegistry, Registry
+from safe_singleton.utils.registry.exceptions import (
+    AlreadyRegisteredError,
+    NotRegisteredError,
+)
+
+
+for_both = pytest.mark.parametrize("cls", [Registry, ConcurrentRegistry])
+
+
+@for_both
+def test_register_and_unregister(cls: type[Registry]):
+    registry = cls()
+    registry.register("a", 1)
+    assert registry["a"] == 1
+
+    with pytest.raises(AlreadyRegisteredError):
+        registry.register("a", 2)
+
+    registry.register("a", 2, force=True)
+    assert registry.unregister("a") == 2
+    assert "a" not in registry
+
+    with pytest.raises(NotRegisteredError):
+        registry.unregister("a")
+
+
+@for_both
+def test_try_register_and_unregister(cls: type[Registry]):
+    registry = cls({"a": 1})
+    registry.try_register("a", 2).try_register("b", 3)
+    assert registry.to_dict() == {"a": 1, "b": 3}
+    assert registry.try_unregister("a") == 1
+    assert registry.try_unregister("a") is None
+
+
+@for_both
+def test_try_unregister_value(cls: type[Registry]):
+    value = object()
+    registry = cls({"a": value})
+    assert not registry.try_unregister_value("a", object())
+    assert not registry.try_unregister_value("b", value)
+    assert registry.try_unregister_value("a", value)
+    assert "a" not in registry
+
+
+def test_concurrent_register_is_atomic():
+    n_threads = 16
+    registry = ConcurrentRegistry()
+    barrier = Barrier(n_threads)
+    winners = []
+
+    def run(i: int) -> None:
+        barrier.wait()
+        try:
+            registry.register("key", i)
+        except AlreadyRegisteredError:
+            return
+        winners.append(i)
+
+    threads = [Thread(target=run, args=(i,)) for i in range(n_threads)]
+
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(winners) == 1
+    assert registry["key"] == winners[0]
+
+
+@for_both
+def test_snapshot_is_not_affected_by_modifications(cls: type[Registry]):
+    registry = cls({"a": 1})
+    snapshot = registry.snapshot()
+
+    registry.register("b", 2)
+    registry.unregister("a")
+    newer = registry.snapshot()
+    registry.clear()
+
+    assert dict(snapshot) == {"a": 1}
+    assert dict(newer) == {"b": 2}
+    assert snapshot.version < newer.version < registry.version
+    assert len(registry) == 0
+
+
+@for_both
+def test_snapshot_can_be_iterated_during_modification(cls: type[Registry]):
+    registry = cls({i: i for i in range(10)})
+
+    for key in registry.snapshot():
+        registry.register(key + 100, key)
+
+    assert len(registry) == 20
+
+
+@for_both
+def test_snapshots_share_memory_until_modified(cls: type[Registry]):
+    registry = cls({"a": 1})
+    first = registry.snapshot()
+    second = registry.snapshot()
+    assert first.items() == second.items()
+    assert first._memory is second._memory
+
+
+@for_both
+def test_register_many_is_atomic(cls: type[Registry]):
+    registry = cls({"a": 1})
+
+    with pytest.raises(AlreadyRegisteredError):
+        registry.register_many([("b", 2), ("a", 3)])
+    with pytest.raises(AlreadyRegisteredError):
+        registry.register_many([("b", 2), ("b", 3)])
+    assert registry.to_dict() == {"a": 1}
+
+    registry.register_many({"b": 2, "c": 3})
+    registry.register_many([("a", 4)], force=True)
+    assert registry.to_dict() == {"a": 4, "b": 2, "c": 3}
+
+
+@for_both
+def test_unregister_many_is_atomic(cls: type[Registry]):
+    registry = cls({"a": 1, "b": 2, "c": 3})
+
+    with pytest.raises(NotRegisteredError):
+        registry.unregister_many(["a", "d"])
+    with pytest.raises(NotRegisteredError):
+        registry.unregister_many(["a", "a"])
+    assert len(registry) == 3
+
+    assert registry.unregister_many(["c", "a"]) == [3, 1]
+    assert registry.to_dict() == {"b": 2}
+
+
+@for_both
+def test_get_many(cls: type[Registry]):
+    registry = cls({"a": 1})
+    assert registry.get_many(["a", "b"]) == [1, None]
+    assert registry.get_many(["b"], 0) == [0]
+
+
+@for_both
+def test_bulk_path_of_ior_and_from_iterable(cls: type[Registry]):
+    registry = cls({"a": 1})
+    registry |= {"b": 2}
+    assert registry.to_dict() == {"a": 1, "b": 2}
+
+    with pytest.raises(AlreadyRegisteredError):
+        registry |= {"c": 3, "a": 4}
+    assert "c" not in registry
+
+    with pytest.raises(AlreadyRegisteredError):
+        cls.from_iterable([("a", 1), ("a", 2)])